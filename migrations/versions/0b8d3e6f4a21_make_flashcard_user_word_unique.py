@@ -0,0 +1,33 @@
+"""make flashcard user word unique
+
+Revision ID: 0b8d3e6f4a21
+Revises: f7a2c4e8d1b3
+Create Date: 2026-10-19 10:21:37.402815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b8d3e6f4a21'
+down_revision: Union[str, None] = 'f7a2c4e8d1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep the oldest card of every (user_id, word_id) pair before enforcing uniqueness
+    op.execute(
+        "DELETE FROM flashcard f USING flashcard older "
+        "WHERE f.user_id = older.user_id AND f.word_id = older.word_id AND f.id > older.id"
+    )
+    op.drop_index('ix_flashcard_user_id_word_id', table_name='flashcard')
+    op.create_index('ix_flashcard_user_id_word_id', 'flashcard', ['user_id', 'word_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flashcard_user_id_word_id', table_name='flashcard')
+    op.create_index('ix_flashcard_user_id_word_id', 'flashcard', ['user_id', 'word_id'], unique=False)
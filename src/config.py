@@ -13,10 +13,16 @@ DB_PORT: str = environ.get("DB_PORT", message)
 DB_NAME: str = environ.get("DB_NAME", message)
 DB_USER: str = environ.get("DB_USER", message)
 DB_PASS: str = environ.get("DB_PASS", message)
+DB_POOL_SIZE: int = int(environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW: int = int(environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT: float = float(environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE: int = int(environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING: bool = environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
 
 # REDIS
 REDIS_HOST: str = environ.get("REDIS_HOST", message)
 REDIS_PORT: int = environ.get("REDIS_PORT", message)
+REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 
 # RabbitMQ
 RabbitMQ_USERNAME: str = environ.get("RabbitMQ_USERNAME")
@@ -30,7 +36,50 @@ TOKEN_BOT: str = environ.get("TOKEN_BOT", message)
 TELEGRAM_BOT_HOST: str = environ.get("TELEGRAM_BOT_HOST", message)
 TELEGRAM_BOT_PORT: int = int(environ.get("TELEGRAM_BOT_PORT", message))
 WEBHOOK_PATH: str = environ.get("WEBHOOK_PATH", message)
+METRICS_PATH: str = environ.get("METRICS_PATH", "/metrics")
 NGROK_API_KEY: str = environ.get("NGROK_API_KEY", message)
 TELEGRAM_ADMIN_IDS = list(map(int, environ.get("ADMIN_IDS", message).split(",")))
 
 LOG_DIRECTORY: str = "logs/"
+
+# SCHEDULED MESSAGES
+DISPATCHER_CONCURRENCY: int = int(environ.get("DISPATCHER_CONCURRENCY", 20))
+TELEGRAM_GLOBAL_RATE: float = float(environ.get("TELEGRAM_GLOBAL_RATE", 30))  # messages per second
+TELEGRAM_CHAT_INTERVAL: float = float(environ.get("TELEGRAM_CHAT_INTERVAL", 1))  # seconds between messages to one chat
+DISPATCHER_MAX_ATTEMPTS: int = int(environ.get("DISPATCHER_MAX_ATTEMPTS", 5))
+DISPATCHER_RETRY_BACKOFF: float = float(environ.get("DISPATCHER_RETRY_BACKOFF", 30))  # seconds, doubled per attempt
+DEAD_LETTER_MAX: int = int(environ.get("DEAD_LETTER_MAX", 10_000))
+NOTIFICATION_DAY_START: int = int(environ.get("NOTIFICATION_DAY_START", 9))  # hour
+NOTIFICATION_DAY_END: int = int(environ.get("NOTIFICATION_DAY_END", 21))  # hour
+NOTIFICATION_PLAN_BATCH: int = int(environ.get("NOTIFICATION_PLAN_BATCH", 1000))
+NOTIFICATION_PLAN_INTERVAL: int = int(environ.get("NOTIFICATION_PLAN_INTERVAL", 300))  # seconds
+DEFAULT_TIMEZONE: str = environ.get("DEFAULT_TIMEZONE", "UTC")  # IANA name, for users without a timezone
+
+# FSM
+FSM_STORAGE: str = environ.get("FSM_STORAGE", "memory")  # memory | redis
+FSM_STATE_TTL: int = int(environ.get("FSM_STATE_TTL", 7 * 24 * 60 * 60))
+FSM_DATA_TTL: int = int(environ.get("FSM_DATA_TTL", 7 * 24 * 60 * 60))
+
+# CACHE
+USER_CACHE_MAXSIZE: int = int(environ.get("USER_CACHE_MAXSIZE", 10_000))
+USER_CACHE_TTL: float = float(environ.get("USER_CACHE_TTL", 60))
+USER_REDIS_CACHE_ENABLED: bool = environ.get("USER_REDIS_CACHE_ENABLED", "false").lower() == "true"
+USER_REDIS_CACHE_TTL: int = int(environ.get("USER_REDIS_CACHE_TTL", 300))
+
+# HTTP
+HTTP_POOL_LIMIT: int = int(environ.get("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST: int = int(environ.get("HTTP_POOL_LIMIT_PER_HOST", 20))
+HTTP_KEEPALIVE_TIMEOUT: float = float(environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))
+HTTP_TIMEOUT: float = float(environ.get("HTTP_TIMEOUT", 10))
+HTTP_RETRIES: int = int(environ.get("HTTP_RETRIES", 2))
+HTTP_BACKOFF: float = float(environ.get("HTTP_BACKOFF", 0.5))
+
+# REVIEW LOG
+REVIEW_LOG_BATCH_SIZE: int = int(environ.get("REVIEW_LOG_BATCH_SIZE", 500))
+REVIEW_LOG_FLUSH_INTERVAL_MS: int = int(environ.get("REVIEW_LOG_FLUSH_INTERVAL_MS", 2000))
+REVIEW_LOG_MAX_BUFFER: int = int(environ.get("REVIEW_LOG_MAX_BUFFER", 50_000))
+
+# MEDIA
+AUDIO_CACHE_DIRECTORY: str = environ.get("AUDIO_CACHE_DIRECTORY", "media/audio/")
+AUDIO_CACHE_MAX_BYTES: int = int(environ.get("AUDIO_CACHE_MAX_BYTES", 100 * 1024 * 1024))
+AUDIO_FILE_ID_CACHE_SIZE: int = int(environ.get("AUDIO_FILE_ID_CACHE_SIZE", 10_000))
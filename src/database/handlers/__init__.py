@@ -6,11 +6,15 @@ from src.database.schemas.base_schemas import Base
 from .user import UserHandler
 from .word import WordHandler
 from .flashcard import FlashcardHandler
+from .media_file import MediaFileHandler
+from .review_log import ReviewLogHandler
 
 class Handlers:
     user = UserHandler()
     word = WordHandler()
     flashcard = FlashcardHandler()
+    media_file = MediaFileHandler()
+    review_log = ReviewLogHandler()
 
     @staticmethod
     async def handle_not_found_error(coro: Coroutine[Any, Any, Any], return_if_err: Any = None) -> Optional[Union[Base | List[Base]]]:
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime, time
+from typing import List, Optional, Tuple, Dict, Any, Sequence
 from sqlalchemy import func
 
 from src.database.schemas import (
@@ -6,12 +7,14 @@ from src.database.schemas import (
     FlashcardSchemaFromDB,
     FlashcardSchemaOut,
     FlashcardSchemaUpdate,
+    FlashcardStatsSchemaOut,
+    WordSchemaOut,
+    ReviewLogSchemaToDB,
 )
 from src.database.utils.UnitOfWork import UnitOfWork
 from src.database.utils.AbstractHandler import AbstractHandler
 from src.services.SingletonBase import SingletonBase
 from src.database.exceptions import NotFoundError
-from src.services.spaced_repetition import SpacedRepetition
 
 from .word import WordHandler
 
@@ -31,14 +34,66 @@ class FlashcardHandler(AbstractHandler, SingletonBase):
             raise NotFoundError("Flashcards are not found")
         return [FlashcardSchemaFromDB.model_validate(fc) for fc in fcs]
 
+    @staticmethod
+    async def get_due(
+            uow: UnitOfWork,
+            user_id: int,
+            now: Optional[datetime] = None,
+            limit: int = 20,
+            after: Optional[Tuple[datetime, int]] = None
+    ) -> List[FlashcardSchemaFromDB]:
+        """
+        Returns the user's review queue ordered by urgency.
+        To get the next page pass (next_review, id) of the last returned card as `after`.
+        """
+        now = now if now else datetime.now()
+        fcs = await uow.flashcard.find_due(user_id=user_id, now=now, limit=limit, after=after)
+        if not fcs:
+            raise NotFoundError("Due flashcards are not found")
+        return [FlashcardSchemaFromDB.model_validate(fc) for fc in fcs]
+
+    @staticmethod
+    async def get_stats(uow: UnitOfWork, user_id: int, now: Optional[datetime] = None) -> FlashcardStatsSchemaOut:
+        """Counts the user's flashcards (due = not learned and scheduled until the end of today)."""
+        now = now if now else datetime.now()
+        rows = await uow.flashcard.count_stats(user_id=user_id, due_before=datetime.combine(now.date(), time.max))
+        total = sum(row["total"] for row in rows)
+        learned = sum(row["learned"] for row in rows)
+        return FlashcardStatsSchemaOut(
+            total=total,
+            learned=learned,
+            learning=total - learned,
+            due=sum(row["due"] for row in rows),
+            by_level={row["level"]: row["total"] for row in rows},
+        )
+
     @staticmethod
     async def add_one(uow: UnitOfWork, flashcard: FlashcardSchemaToDB) -> int:
         return await uow.flashcard.add_one(data=flashcard)
 
+    @staticmethod
+    async def add_many(uow: UnitOfWork, flashcards: Sequence[FlashcardSchemaToDB]) -> List[int]:
+        return await uow.flashcard.add_many(data=flashcards)
+
+    @staticmethod
+    async def upsert_many(
+            uow: UnitOfWork,
+            flashcards: Sequence[FlashcardSchemaToDB],
+            index_elements: Sequence[str] = ("user_id", "word_id"),
+            update_columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        return await uow.flashcard.upsert_many(
+            data=flashcards, index_elements=index_elements, update_columns=update_columns
+        )
+
     @staticmethod
     async def update_one(uow: UnitOfWork, data: FlashcardSchemaUpdate, **filter_by) -> int:
         return await uow.flashcard.edit_one(data, **filter_by)
 
+    @staticmethod
+    async def update_many(uow: UnitOfWork, data: Dict[Any, FlashcardSchemaUpdate], key: str = "id") -> List[int]:
+        return await uow.flashcard.edit_many(data, key=key)
+
     @staticmethod
     async def delete_one(uow: UnitOfWork, **filter_by) -> int:
         return await uow.flashcard.delete_one(**filter_by)
@@ -52,48 +107,88 @@ class FlashcardHandler(AbstractHandler, SingletonBase):
         fc = await self.get_one(uow, _filter, **filter_by)
         return await self.enrich(uow, fc)
 
+    @staticmethod
+    def enrich_joined(data: dict) -> FlashcardSchemaOut:
+        """Builds FlashcardSchemaOut from a row already joined with its word (see find_all_with_words)."""
+        word = WordSchemaOut(**data["word"], learned=data["learned"])
+        return FlashcardSchemaOut(**{**data, "word": word})
+
     async def get_enriched_all(self, uow: UnitOfWork, _filter: func = None, **filter_by) -> List[FlashcardSchemaOut]:
-        fcs = await self.get_all(uow, _filter, **filter_by)
-        return [await self.enrich(uow, fc) for fc in fcs]
+        fcs = await uow.flashcard.find_all_with_words(_filter, **filter_by)
+        if not fcs:
+            raise NotFoundError("Flashcards are not found")
+        return [self.enrich_joined(fc) for fc in fcs]
+
+    async def get_enriched_page(
+            self,
+            uow: UnitOfWork,
+            limit: int,
+            after_id: Optional[int] = None,
+            before_id: Optional[int] = None,
+            _filter: func = None,
+            **filter_by
+    ) -> Tuple[List[FlashcardSchemaOut], bool]:
+        """
+        Returns one page of enriched flashcards ordered by id and whether there are more
+        cards in the requested direction (after `after_id` or before `before_id`).
+        """
+        fcs = await uow.flashcard.find_page_with_words(limit + 1, after_id, before_id, _filter, **filter_by)
+        if not fcs:
+            raise NotFoundError("Flashcards are not found")
+        has_more = len(fcs) > limit
+        fcs = fcs[:limit]
+        if before_id is not None:
+            fcs.reverse()
+        return [self.enrich_joined(fc) for fc in fcs], has_more
 
     @staticmethod
     async def process_answer(
         uow: UnitOfWork,
-        flashcard_id: int,
-        quality: int  # 0-5, где 5 - отлично, 0 - не помню
-    ) -> FlashcardSchemaOut:
+        user_id: int,
+        word_id: int,
+        quality: int,  # 0-5, где 5 - отлично, 0 - не помню
+        expected_repetitions: Optional[int] = None,
+        elapsed_ms: Optional[int] = None
+    ) -> Tuple[FlashcardSchemaOut, ReviewLogSchemaToDB]:
         """
-        Обрабатывает ответ пользователя и обновляет параметры карточки.
+        Обрабатывает ответ пользователя и обновляет параметры карточки
+        одним запросом (UPDATE ... RETURNING вместе со словом и прежними значениями).
         
         Args:
             uow: Unit of Work
-            flashcard_id: ID карточки
+            user_id: ID пользователя
+            word_id: ID слова
             quality: Качество ответа (0-5)
+            expected_repetitions: Если задано, карточка обновится только при этом числе повторений
+            elapsed_ms: Время от показа карточки до ответа, для журнала повторений
             
         Returns:
-            FlashcardSchemaOut: Обновленная карточка
+            Tuple[FlashcardSchemaOut, ReviewLogSchemaToDB]: Обновленная карточка и запись для журнала повторений
         """
-        # Получаем текущую карточку
-        flashcard = await FlashcardHandler.get_one(uow, id=flashcard_id)
-        
-        # Рассчитываем новые значения
-        new_interval, new_ease_factor, new_repetitions, next_review = SpacedRepetition.calculate_next_review(
-            current_interval=flashcard.interval,
-            current_ease_factor=flashcard.hardness,
-            repetitions=flashcard.repetitions,
-            quality=quality
+        now = datetime.now()
+        flashcard = await uow.flashcard.apply_review(
+            user_id=user_id,
+            word_id=word_id,
+            quality=quality,
+            now=now,
+            expected_repetitions=expected_repetitions
         )
-        
-        # Обновляем карточку
-        update_data = FlashcardSchemaUpdate(
-            interval=new_interval,
-            hardness=new_ease_factor,
-            repetitions=new_repetitions,
-            next_review=next_review,
-            learned=new_repetitions >= 3  # Считаем слово выученным после 3 успешных повторений
+        if not flashcard:
+            raise NotFoundError("Flashcard is not found")
+
+        previous = flashcard.pop("previous")
+        review = ReviewLogSchemaToDB(
+            user_id=user_id,
+            flashcard_id=flashcard["id"],
+            word_id=word_id,
+            quality=quality,
+            elapsed_ms=elapsed_ms,
+            previous_interval=previous["interval"],
+            previous_hardness=previous["hardness"],
+            previous_repetitions=previous["repetitions"],
+            interval=flashcard["interval"],
+            hardness=flashcard["hardness"],
+            repetitions=flashcard["repetitions"],
+            reviewed_at=now,
         )
-        
-        await FlashcardHandler.update_one(uow, update_data, id=flashcard_id)
-        
-        # Возвращаем обновленную карточку
-        return await FlashcardHandler().get_enriched_one(uow, id=flashcard_id)
\ No newline at end of file
+        return FlashcardHandler.enrich_joined(flashcard), review
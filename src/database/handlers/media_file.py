@@ -0,0 +1,78 @@
+from typing import List, Dict, Any, Sequence, Optional
+from sqlalchemy import func
+
+from src.database.schemas import (
+    MediaFileSchemaToDB,
+    MediaFileSchemaFromDB,
+    MediaFileSchemaOut,
+    MediaFileSchemaUpdate,
+    MediaKindSchema,
+)
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.database.utils.AbstractHandler import AbstractHandler
+from src.services.SingletonBase import SingletonBase
+from src.database.exceptions import NotFoundError
+
+
+class MediaFileHandler(AbstractHandler, SingletonBase):
+    @staticmethod
+    async def get_one(uow: UnitOfWork, _filter: func = None, **filter_by) -> MediaFileSchemaFromDB:
+        media_file = await uow.media_file.find_one(_filter, **filter_by)
+        if not media_file:
+            raise NotFoundError("Media file is not found")
+        return MediaFileSchemaFromDB.model_validate(media_file)
+
+    @staticmethod
+    async def get_all(uow: UnitOfWork, _filter: func = None, **filter_by) -> List[MediaFileSchemaFromDB]:
+        media_files = await uow.media_file.find_all(_filter=_filter, **filter_by)
+        if not media_files:
+            raise NotFoundError("Media files are not found")
+        return [MediaFileSchemaFromDB.model_validate(media_file) for media_file in media_files]
+
+    @staticmethod
+    async def get_file_id(uow: UnitOfWork, key: str, kind: MediaKindSchema = MediaKindSchema.VOICE) -> str:
+        media_file = await MediaFileHandler.get_one(uow, key=key, kind=kind)
+        return media_file.file_id
+
+    @staticmethod
+    async def add_one(uow: UnitOfWork, media_file: MediaFileSchemaToDB) -> int:
+        return await uow.media_file.upsert_one(data=media_file)
+
+    @staticmethod
+    async def add_many(uow: UnitOfWork, media_files: Sequence[MediaFileSchemaToDB]) -> List[int]:
+        return await MediaFileHandler.upsert_many(uow, media_files)
+
+    @staticmethod
+    async def upsert_many(
+            uow: UnitOfWork,
+            media_files: Sequence[MediaFileSchemaToDB],
+            index_elements: Sequence[str] = ("key", "kind"),
+            update_columns: Optional[Sequence[str]] = ("file_id",)
+    ) -> List[int]:
+        return await uow.media_file.upsert_many(
+            data=media_files, index_elements=index_elements, update_columns=update_columns
+        )
+
+    @staticmethod
+    async def update_one(uow: UnitOfWork, data: MediaFileSchemaUpdate, **filter_by) -> int:
+        return await uow.media_file.edit_one(data, **filter_by)
+
+    @staticmethod
+    async def update_many(uow: UnitOfWork, data: Dict[Any, MediaFileSchemaUpdate], key: str = "id") -> List[int]:
+        return await uow.media_file.edit_many(data, key=key)
+
+    @staticmethod
+    async def delete_one(uow: UnitOfWork, **filter_by) -> int:
+        return await uow.media_file.delete_one(**filter_by)
+
+    @staticmethod
+    def enrich(data: MediaFileSchemaFromDB) -> MediaFileSchemaOut:
+        return MediaFileSchemaOut(**data.model_dump())
+
+    async def get_enriched_one(self, uow: UnitOfWork, _filter: func = None, **filter_by) -> MediaFileSchemaOut:
+        media_file = await self.get_one(uow, _filter, **filter_by)
+        return self.enrich(media_file)
+
+    async def get_enriched_all(self, uow: UnitOfWork, _filter: func = None, **filter_by) -> List[MediaFileSchemaOut]:
+        media_files = await self.get_all(uow, _filter, **filter_by)
+        return [self.enrich(media_file) for media_file in media_files]
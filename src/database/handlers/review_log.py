@@ -0,0 +1,73 @@
+from typing import List, Dict, Any, Sequence, Optional
+from sqlalchemy import func
+
+from src.database.schemas import (
+    ReviewLogSchemaToDB,
+    ReviewLogSchemaFromDB,
+    ReviewLogSchemaOut,
+    ReviewLogSchemaUpdate,
+)
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.database.utils.AbstractHandler import AbstractHandler
+from src.services.SingletonBase import SingletonBase
+from src.database.exceptions import NotFoundError
+
+
+class ReviewLogHandler(AbstractHandler, SingletonBase):
+    @staticmethod
+    async def get_one(uow: UnitOfWork, _filter: func = None, **filter_by) -> ReviewLogSchemaFromDB:
+        review = await uow.review_log.find_one(_filter, **filter_by)
+        if not review:
+            raise NotFoundError("Review is not found")
+        return ReviewLogSchemaFromDB.model_validate(review)
+
+    @staticmethod
+    async def get_all(uow: UnitOfWork, _filter: func = None, **filter_by) -> List[ReviewLogSchemaFromDB]:
+        reviews = await uow.review_log.find_all(_filter=_filter, **filter_by)
+        if not reviews:
+            raise NotFoundError("Reviews are not found")
+        return [ReviewLogSchemaFromDB.model_validate(review) for review in reviews]
+
+    @staticmethod
+    async def add_one(uow: UnitOfWork, review: ReviewLogSchemaToDB) -> int:
+        return await uow.review_log.add_one(data=review)
+
+    @staticmethod
+    async def add_many(uow: UnitOfWork, reviews: Sequence[ReviewLogSchemaToDB]) -> List[int]:
+        return await uow.review_log.add_many(data=reviews)
+
+    @staticmethod
+    async def upsert_many(
+            uow: UnitOfWork,
+            reviews: Sequence[ReviewLogSchemaToDB],
+            index_elements: Sequence[str],
+            update_columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """The log has no natural key, so the conflict key must be named (and present in the rows)."""
+        return await uow.review_log.upsert_many(
+            data=reviews, index_elements=index_elements, update_columns=update_columns
+        )
+
+    @staticmethod
+    async def update_one(uow: UnitOfWork, data: ReviewLogSchemaUpdate, **filter_by) -> int:
+        return await uow.review_log.edit_one(data, **filter_by)
+
+    @staticmethod
+    async def update_many(uow: UnitOfWork, data: Dict[Any, ReviewLogSchemaUpdate], key: str = "id") -> List[int]:
+        return await uow.review_log.edit_many(data, key=key)
+
+    @staticmethod
+    async def delete_one(uow: UnitOfWork, **filter_by) -> int:
+        return await uow.review_log.delete_one(**filter_by)
+
+    @staticmethod
+    def enrich(data: ReviewLogSchemaFromDB) -> ReviewLogSchemaOut:
+        return ReviewLogSchemaOut(**data.model_dump())
+
+    async def get_enriched_one(self, uow: UnitOfWork, _filter: func = None, **filter_by) -> ReviewLogSchemaOut:
+        review = await self.get_one(uow, _filter, **filter_by)
+        return self.enrich(review)
+
+    async def get_enriched_all(self, uow: UnitOfWork, _filter: func = None, **filter_by) -> List[ReviewLogSchemaOut]:
+        reviews = await self.get_all(uow, _filter, **filter_by)
+        return [self.enrich(review) for review in reviews]
@@ -1,5 +1,5 @@
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional, Dict, Any, Sequence
 
 from src.database.schemas import (
     UserSchemaToDB,
@@ -11,9 +11,14 @@ from src.database.utils.UnitOfWork import UnitOfWork
 from src.database.utils.AbstractHandler import AbstractHandler
 from src.services.SingletonBase import SingletonBase
 from src.database.exceptions import NotFoundError
+from src.services.UserCache import UserCache
+from src.services.RedisUserCache import RedisUserCache
+from src.config import USER_REDIS_CACHE_ENABLED
 
 
 class UserHandler(AbstractHandler, SingletonBase):
+    cache = UserCache()
+    redis_cache: Optional[RedisUserCache] = RedisUserCache() if USER_REDIS_CACHE_ENABLED else None
 
     @staticmethod
     async def get_one(uow: UnitOfWork, _filter: func = None, **filter_by) -> UserSchemaFromDB:
@@ -29,20 +34,91 @@ class UserHandler(AbstractHandler, SingletonBase):
             raise NotFoundError("Users are not found")
         return [UserSchemaFromDB.model_validate(user) for user in users]
 
+    @staticmethod
+    async def get_notifiable(uow: UnitOfWork, limit: int, after_id: Optional[int] = None) -> List[UserSchemaFromDB]:
+        users = await uow.user.find_notifiable(limit=limit, after_id=after_id)
+        if not users:
+            raise NotFoundError("Users are not found")
+        return [UserSchemaFromDB.model_validate(user) for user in users]
+
+    @staticmethod
+    async def get_cached(uow: UnitOfWork, user_id: int) -> UserSchemaFromDB:
+        """get_one by id served from the in-process cache, then from Redis (if enabled), then from Postgres."""
+        user = UserHandler.cache.get(user_id)
+        if user is not None:
+            return user
+
+        # read before loading, so a user invalidated meanwhile is not cached
+        generation = UserHandler.cache.generation
+        version = None
+        if UserHandler.redis_cache:
+            user, version = await UserHandler.redis_cache.get(user_id)
+        if user is None:
+            user = await UserHandler.get_one(uow, id=user_id)
+            if UserHandler.redis_cache:
+                await UserHandler.redis_cache.set(user, version)
+        UserHandler.cache.set(user, generation)
+        return user
+
+    @staticmethod
+    async def invalidate_cache(uow: UnitOfWork, user_id: Optional[int] = None) -> None:
+        """Drops the user (all users if the id is unknown) from the caches once `uow` commits."""
+        async def invalidate():
+            UserHandler.cache.invalidate(user_id)
+            if UserHandler.redis_cache:
+                await UserHandler.redis_cache.invalidate(user_id)
+
+        uow.after_commit(invalidate)
+
+    @staticmethod
+    async def invalidate_cache_many(uow: UnitOfWork, user_ids: Sequence[int]) -> None:
+        async def invalidate():
+            UserHandler.cache.invalidate_many(user_ids)
+            if UserHandler.redis_cache:
+                await UserHandler.redis_cache.invalidate_many(user_ids)
+
+        uow.after_commit(invalidate)
+
     @staticmethod
     async def add_one(uow: UnitOfWork, user: UserSchemaToDB) -> int:
         user_id = await uow.user.add_one(data=user)
+        await UserHandler.invalidate_cache(uow, user_id)
         return user_id
 
+    @staticmethod
+    async def add_many(uow: UnitOfWork, users: Sequence[UserSchemaToDB]) -> List[int]:
+        user_ids = await uow.user.add_many(data=users)
+        await UserHandler.invalidate_cache_many(uow, user_ids)
+        return user_ids
+
+    @staticmethod
+    async def upsert_many(
+            uow: UnitOfWork,
+            users: Sequence[UserSchemaToDB],
+            index_elements: Sequence[str] = ("id",),
+            update_columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        user_ids = await uow.user.upsert_many(data=users, index_elements=index_elements, update_columns=update_columns)
+        await UserHandler.invalidate_cache_many(uow, user_ids)
+        return user_ids
+
+    @staticmethod
+    async def update_many(uow: UnitOfWork, data: Dict[Any, UserSchemaUpdate], key: str = "id") -> List[int]:
+        user_ids = await uow.user.edit_many(data, key=key)
+        await UserHandler.invalidate_cache_many(uow, user_ids)
+        return user_ids
+
     @staticmethod
     async def update_one(uow: UnitOfWork, data: UserSchemaUpdate, **filter_by) -> int:
-        result = await uow.user.edit_one(data, **filter_by)
-        return result
+        user_id = await uow.user.edit_one(data, **filter_by)
+        await UserHandler.invalidate_cache(uow, user_id)
+        return user_id
 
     @staticmethod
     async def delete_one(uow: UnitOfWork, **filter_by) -> int:
-        result = await uow.user.delete_one(**filter_by)
-        return result
+        user_id = await uow.user.delete_one(**filter_by)
+        await UserHandler.invalidate_cache(uow, user_id)
+        return user_id
 
     @staticmethod
     def enrich(uow: UnitOfWork, data: UserSchemaFromDB) -> UserSchemaOut:
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Dict, Any, Sequence, Optional, Iterable, Tuple
 from sqlalchemy import func
 
 from src.database.schemas import (
@@ -6,6 +7,7 @@ from src.database.schemas import (
     WordSchemaFromDB,
     WordSchemaOut,
     WordSchemaUpdate,
+    EnglishLevel,
 )
 from src.database.utils.UnitOfWork import UnitOfWork
 from src.database.utils.AbstractHandler import AbstractHandler
@@ -28,14 +30,48 @@ class WordHandler(AbstractHandler, SingletonBase):
             raise NotFoundError("Words are not found")
         return [WordSchemaFromDB.model_validate(word) for word in words]
 
+    @staticmethod
+    async def get_random_unseen(uow: UnitOfWork, user_id: int, level: EnglishLevel) -> WordSchemaFromDB:
+        word = await uow.word.find_random_unseen(user_id=user_id, level=level)
+        if not word:
+            raise NotFoundError("Unseen word is not found")
+        return WordSchemaFromDB.model_validate(word)
+
     @staticmethod
     async def add_one(uow: UnitOfWork, word: WordSchemaToDB) -> int:
         return await uow.word.add_one(data=word)
 
+    @staticmethod
+    async def add_many(uow: UnitOfWork, words: Sequence[WordSchemaToDB]) -> List[int]:
+        return await uow.word.add_many(data=words)
+
+    @staticmethod
+    async def upsert_many(
+            uow: UnitOfWork,
+            words: Sequence[WordSchemaToDB],
+            index_elements: Sequence[str] = ("text",),
+            update_columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        return await uow.word.upsert_many(data=words, index_elements=index_elements, update_columns=update_columns)
+
+    @staticmethod
+    async def bulk_import(uow: UnitOfWork, batches: Iterable[List[WordSchemaToDB]]) -> Tuple[int, int]:
+        """COPYs the batches into a staging table and merges it into the vocabulary. Returns (inserted, updated)."""
+        await uow.word.create_import_table()
+        for batch in batches:
+            await uow.word.copy_to_import_table(
+                (word.text, word.translation, word.example, word.level.value) for word in batch
+            )
+        return await uow.word.merge_import_table(now=datetime.now())
+
     @staticmethod
     async def update_one(uow: UnitOfWork, data: WordSchemaUpdate, **filter_by) -> int:
         return await uow.word.edit_one(data, **filter_by)
 
+    @staticmethod
+    async def update_many(uow: UnitOfWork, data: Dict[Any, WordSchemaUpdate], key: str = "id") -> List[int]:
+        return await uow.word.edit_many(data, key=key)
+
     @staticmethod
     async def delete_one(uow: UnitOfWork, **filter_by) -> int:
         return await uow.word.delete_one(**filter_by)
@@ -1,8 +1,12 @@
 from .user import user
 from .word import word
 from .flashcard import flashcard
+from .media_file import media_file
+from .review_log import review_log
 
 class Models:
     user = user
     word = word
     flashcard = flashcard
+    media_file = media_file
+    review_log = review_log
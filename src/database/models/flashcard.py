@@ -7,7 +7,8 @@ from sqlalchemy import (
     TIMESTAMP,
     Integer,
     Boolean,
-    Float
+    Float,
+    Index
 )
 
 from src.database.database import metadata
@@ -25,4 +26,7 @@ flashcard = Table(
     Column("learned", Boolean, nullable=False, default=False),
     Column("created_at", TIMESTAMP, default=datetime.now),
     Column("updated_at", TIMESTAMP, default=datetime.now, onupdate=datetime.now),
+    Index("ix_flashcard_user_id_word_id", "user_id", "word_id", unique=True),
+    Index("ix_flashcard_user_id_learned_next_review", "user_id", "learned", "next_review"),
+    Index("ix_flashcard_user_id_learned_id", "user_id", "learned", "id"),
 )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import (
+    Table,
+    Column,
+    String,
+    TIMESTAMP,
+    Integer,
+    UniqueConstraint
+)
+
+from src.database.schemas.media_file import MediaKindSchema
+from src.database.database import metadata
+
+media_file = Table(
+    "media_file",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("key", String(64), nullable=False),  # content hash of the asset
+    Column("kind", String(16), nullable=False, default=MediaKindSchema.VOICE),
+    Column("file_id", String(255), nullable=False),  # Telegram file_id returned after the first upload
+    Column("created_at", TIMESTAMP, default=datetime.now),
+    UniqueConstraint("key", "kind"),
+)
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import (
+    Table,
+    Column,
+    BIGINT,
+    ForeignKey,
+    TIMESTAMP,
+    Integer,
+    SmallInteger,
+    Float,
+    Index
+)
+
+from src.database.database import metadata
+
+review_log = Table(
+    "review_log",
+    metadata,
+    Column("id", BIGINT, primary_key=True, autoincrement=True),
+    Column("user_id", BIGINT, ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+    Column("flashcard_id", Integer, ForeignKey("flashcard.id", ondelete="CASCADE"), nullable=False),
+    Column("word_id", Integer, nullable=False),
+    Column("quality", SmallInteger, nullable=False),  # 0-5
+    Column("elapsed_ms", Integer, nullable=True),  # from showing the card to the answer
+    Column("previous_interval", Integer, nullable=False),
+    Column("previous_hardness", Float, nullable=False),
+    Column("previous_repetitions", Integer, nullable=False),
+    Column("interval", Integer, nullable=False),
+    Column("hardness", Float, nullable=False),
+    Column("repetitions", Integer, nullable=False),
+    Column("reviewed_at", TIMESTAMP, nullable=False, default=datetime.now),
+    Index("ix_review_log_user_id_reviewed_at", "user_id", "reviewed_at"),
+)
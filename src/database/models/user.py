@@ -23,6 +23,7 @@ user = Table(
     Column("language", String(2), nullable=True),
     Column("english_level", String(2), nullable=True),
     Column("notifications_per_day", Integer, nullable=True),
+    Column("timezone", String(64), nullable=True),  # IANA name, e.g. "Europe/Kyiv"
     Column("status", String(7), nullable=False, default=UserStatusSchema.ACTIVE),
 
     Column("created_at", TIMESTAMP, default=datetime.now),
@@ -4,7 +4,8 @@ from sqlalchemy import (
     Column,
     String,
     TIMESTAMP,
-    Integer
+    Integer,
+    Index
 )
 
 from src.database.database import metadata
@@ -18,4 +19,5 @@ word = Table(
     Column("example", String(512), nullable=True),
     Column("level", String(2), nullable=False),  # A1, A2, B1, etc.
     Column("created_at", TIMESTAMP, default=datetime.now),
+    Index("ix_word_level_id", "level", "id"),
 )
\ No newline at end of file
@@ -1,3 +1,5 @@
 from .user import UserRepository
 from .word import WordRepository
-from .flashcard import FlashcardRepository
\ No newline at end of file
+from .flashcard import FlashcardRepository
+from .media_file import MediaFileRepository
+from .review_log import ReviewLogRepository
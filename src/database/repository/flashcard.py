@@ -1,6 +1,153 @@
-from src.database.models import flashcard
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy import select, update, tuple_, func, and_, case, bindparam, cast, literal, Integer, TIMESTAMP
+
+from src.database.models import flashcard, word
 from src.database.utils.SQLAlchemyRepository import SQLAlchemyRepository
+from src.services.spaced_repetition import SpacedRepetition
 
 
 class FlashcardRepository(SQLAlchemyRepository):
     model = flashcard
+    word_prefix = "word__"
+    previous_prefix = "previous__"
+
+    def _word_columns(self) -> list:
+        return [column.label(f"{self.word_prefix}{column.name}") for column in word.c]
+
+    def _select_with_words(self, _filter: func = None, **filter_by):
+        stmt = (select(self.model, *self._word_columns())
+                .select_from(self.model.join(word, word.c.id == self.model.c.word_id))
+                .where(*(self.model.c[key] == value for key, value in filter_by.items())))
+        if _filter is not None:
+            stmt = stmt.filter(_filter)
+        return stmt
+
+    def _row_with_word(self, row) -> Dict:
+        flashcard_data, word_data = {}, {}
+        for key, value in row._mapping.items():
+            if key.startswith(self.word_prefix):
+                word_data[key[len(self.word_prefix):]] = value
+            else:
+                flashcard_data[key] = value
+        flashcard_data["word"] = word_data
+        return flashcard_data
+
+    async def find_all_with_words(self, _filter: func = None, **filter_by) -> List[Dict]:
+        """Returns flashcards together with their words (under the "word" key) in one joined select."""
+        stmt = self._select_with_words(_filter, **filter_by).order_by(self.model.c.id)
+        res = await self.session.execute(stmt)
+        return [self._row_with_word(row) for row in res.all()]
+
+    async def find_page_with_words(
+            self,
+            limit: int,
+            after_id: Optional[int] = None,
+            before_id: Optional[int] = None,
+            _filter: func = None,
+            **filter_by
+    ) -> List[Dict]:
+        """
+        Keyset page of flashcards joined with their words.
+        Rows come in the direction of travel: ascending id after `after_id`, descending id before `before_id`.
+        """
+        stmt = self._select_with_words(_filter, **filter_by).limit(limit)
+        if before_id is not None:
+            stmt = stmt.where(self.model.c.id < before_id).order_by(self.model.c.id.desc())
+        else:
+            if after_id is not None:
+                stmt = stmt.where(self.model.c.id > after_id)
+            stmt = stmt.order_by(self.model.c.id)
+        res = await self.session.execute(stmt)
+        return [self._row_with_word(row) for row in res.all()]
+
+    async def find_due(
+            self,
+            user_id: int,
+            now: datetime,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict]:
+        """
+        Returns not learned flashcards with next_review <= now, the most overdue first.
+
+        :param after: (next_review, id) of the last card of the previous page (keyset cursor)
+        """
+        stmt = (select(self.model)
+                .where(self.model.c.user_id == user_id,
+                       self.model.c.learned.is_(False),
+                       self.model.c.next_review <= now)
+                .order_by(self.model.c.next_review, self.model.c.id)
+                .limit(limit))
+        if after is not None:
+            stmt = stmt.where(tuple_(self.model.c.next_review, self.model.c.id) > tuple_(*after))
+        res = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in res.all()]
+
+    async def count_stats(self, user_id: int, due_before: datetime) -> List[Dict]:
+        """Returns per-level total/learned/due counters of the user's flashcards in one grouped select."""
+        stmt = (select(word.c.level,
+                       func.count().label("total"),
+                       func.count().filter(self.model.c.learned.is_(True)).label("learned"),
+                       func.count().filter(and_(self.model.c.learned.is_(False),
+                                                self.model.c.next_review <= due_before)).label("due"))
+                .select_from(self.model.join(word, word.c.id == self.model.c.word_id))
+                .where(self.model.c.user_id == user_id)
+                .group_by(word.c.level))
+        res = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in res.all()]
+
+    async def apply_review(
+            self,
+            user_id: int,
+            word_id: int,
+            quality: int,
+            now: datetime,
+            expected_repetitions: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Applies an SM-2 review (see SpacedRepetition.calculate_next_review) in a single
+        UPDATE ... FROM word ... RETURNING: the new values are computed by Postgres from the
+        stored ones and the updated card comes back joined with its word. The card is also
+        joined with itself, so the pre-update interval, hardness and repetitions are returned
+        under the "previous" key.
+
+        :param expected_repetitions: update only if the card still has this many repetitions,
+            so a stale or repeated answer does not apply twice
+        :return: the updated card as in find_all_with_words, None if no card matched
+        """
+        fc = self.model.c
+        previous = self.model.alias("previous")
+        previous_columns = [
+            previous.c[name].label(f"{self.previous_prefix}{name}") for name in ("interval", "hardness", "repetitions")
+        ]
+        ease_factor = func.greatest(
+            fc.hardness + SpacedRepetition.ease_factor_delta(quality), SpacedRepetition.MIN_EASE_FACTOR
+        )
+        interval = case(
+            (fc.repetitions == 0, SpacedRepetition.INITIAL_INTERVAL),
+            (fc.repetitions == 1, SpacedRepetition.SECOND_INTERVAL),
+            else_=cast(func.floor(fc.interval * ease_factor), Integer),
+        )
+        passed = quality >= 3
+        repetitions = fc.repetitions + 1 if passed else literal(0)
+
+        stmt = (update(self.model)
+                .where(fc.word_id == word.c.id, previous.c.id == fc.id, fc.user_id == user_id, fc.word_id == word_id)
+                .values(interval=interval,
+                        hardness=ease_factor,
+                        repetitions=repetitions,
+                        next_review=bindparam("now", now, type_=TIMESTAMP) + func.make_interval(0, 0, 0, interval),
+                        learned=repetitions >= 3 if passed else literal(False))
+                .returning(*fc, *self._word_columns(), *previous_columns))
+        if expected_repetitions is not None:
+            stmt = stmt.where(fc.repetitions == expected_repetitions)
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+
+        data = self._row_with_word(row)
+        data["previous"] = {
+            key[len(self.previous_prefix):]: data.pop(key) for key in list(data) if key.startswith(self.previous_prefix)
+        }
+        return data
@@ -0,0 +1,18 @@
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database.models import media_file
+from src.database.schemas.base_schemas import SchemaToDB
+from src.database.utils.SQLAlchemyRepository import SQLAlchemyRepository
+
+
+class MediaFileRepository(SQLAlchemyRepository):
+    model = media_file
+
+    async def upsert_one(self, data: SchemaToDB) -> int:
+        """Inserts the asset or replaces the file_id of the already registered one."""
+        values = data.model_dump(exclude_none=True)
+        stmt = (insert(self.model).values(**values)
+                .on_conflict_do_update(index_elements=["key", "kind"], set_={"file_id": values["file_id"]})
+                .returning(self.model.c.id))
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
@@ -0,0 +1,6 @@
+from src.database.models import review_log
+from src.database.utils.SQLAlchemyRepository import SQLAlchemyRepository
+
+
+class ReviewLogRepository(SQLAlchemyRepository):
+    model = review_log
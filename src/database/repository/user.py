@@ -1,6 +1,22 @@
+from typing import Optional, List, Dict
+from sqlalchemy import select
+
 from src.database.models import user
+from src.database.schemas.user import UserStatusSchema
 from src.database.utils.SQLAlchemyRepository import SQLAlchemyRepository
 
 
 class UserRepository(SQLAlchemyRepository):
     model = user
+
+    async def find_notifiable(self, limit: int, after_id: Optional[int] = None) -> List[Dict]:
+        """Keyset page (by id) of active users that have chosen a notification frequency."""
+        stmt = (select(self.model)
+                .where(self.model.c.status == UserStatusSchema.ACTIVE,
+                       self.model.c.notifications_per_day.is_not(None))
+                .order_by(self.model.c.id)
+                .limit(limit))
+        if after_id is not None:
+            stmt = stmt.where(self.model.c.id > after_id)
+        res = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in res.all()]
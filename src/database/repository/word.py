@@ -1,6 +1,79 @@
-from src.database.models import word
+from datetime import datetime
+from typing import Optional, Dict, Iterable, Tuple
+from sqlalchemy import select, func, exists, and_, text
+
+from src.database.models import word, flashcard
 from src.database.utils.SQLAlchemyRepository import SQLAlchemyRepository
 
 
 class WordRepository(SQLAlchemyRepository):
     model = word
+    import_table = "word_import"
+    import_columns = ("text", "translation", "example", "level")
+
+    async def find_random_unseen(self, user_id: int, level: str) -> Optional[Dict]:
+        """
+        Picks a random word of the level that the user has no flashcard for.
+
+        A random pivot is drawn between the smallest and the largest id of the level and
+        the first unseen word at or after it is taken (wrapping around to the start of the
+        level), so both lookups are range scans on (level, id) with an anti-join probe of
+        (user_id, word_id) instead of materialising the whole vocabulary.
+        """
+        unseen = and_(
+            self.model.c.level == level,
+            ~exists().where(
+                flashcard.c.user_id == user_id,
+                flashcard.c.word_id == self.model.c.id,
+            ),
+        )
+
+        bounds = (select(func.min(self.model.c.id).label("min_id"), func.max(self.model.c.id).label("max_id"))
+                  .where(self.model.c.level == level).subquery())
+        pivot = select(
+            bounds.c.min_id + func.floor(func.random() * (bounds.c.max_id - bounds.c.min_id + 1))
+        ).scalar_subquery()
+
+        stmt = select(self.model).where(unseen, self.model.c.id >= pivot).order_by(self.model.c.id).limit(1)
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            stmt = select(self.model).where(unseen).order_by(self.model.c.id).limit(1)
+            row = (await self.session.execute(stmt)).one_or_none()
+
+        return dict(row._mapping) if row else None
+
+    async def create_import_table(self) -> None:
+        """Temporary staging table for COPY, dropped together with the transaction."""
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.import_table} "
+            "(position BIGSERIAL, text VARCHAR(128), translation VARCHAR(256), example VARCHAR(512), level VARCHAR(2)) "
+            "ON COMMIT DROP"
+        ))
+
+    async def copy_to_import_table(self, records: Iterable[Tuple]) -> None:
+        """Streams (text, translation, example, level) records into the staging table with COPY."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.import_table, records=records, columns=self.import_columns
+        )
+
+    async def merge_import_table(self, now: datetime) -> Tuple[int, int]:
+        """
+        Merges the staging table into the vocabulary in one statement: the first staged row of
+        every text wins (as in VocabularyImporter.deduplicate), unknown texts are inserted and known ones updated only if they differ,
+        so re-running an import changes nothing. Returns (inserted, updated).
+        """
+        stmt = text(f"""
+            INSERT INTO word (text, translation, example, level, created_at)
+            SELECT DISTINCT ON (text) text, translation, example, level, :now
+            FROM {self.import_table}
+            ORDER BY text, position
+            ON CONFLICT (text) DO UPDATE
+            SET translation = EXCLUDED.translation, example = EXCLUDED.example, level = EXCLUDED.level
+            WHERE (word.translation, word.example, word.level)
+                IS DISTINCT FROM (EXCLUDED.translation, EXCLUDED.example, EXCLUDED.level)
+            RETURNING (xmax = 0) AS inserted
+        """)
+        inserted = (await self.session.execute(stmt, {"now": now})).scalars().all()
+        return sum(inserted), len(inserted) - sum(inserted)
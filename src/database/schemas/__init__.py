@@ -1,3 +1,5 @@
 from .user import *
 from .word import *
 from .flashcard import *
+from .media_file import *
+from .review_log import *
@@ -1,8 +1,9 @@
 from datetime import datetime
 from pydantic import PositiveInt
-from typing import Optional
+from typing import Optional, Dict
 
 from . import WordSchemaOut
+from .common import EnglishLevel
 from .base_schemas import (
     SchemaOut,
     SchemaToDB,
@@ -43,3 +44,10 @@ class FlashcardSchemaUpdate(SchemaUpdate):
     repetitions: Optional[int] = None
     next_review: Optional[datetime] = None
     learned: Optional[bool] = None
+
+class FlashcardStatsSchemaOut(SchemaOut):
+    total: int = 0
+    learned: int = 0
+    learning: int = 0
+    due: int = 0
+    by_level: Dict[EnglishLevel, int] = {}
@@ -0,0 +1,37 @@
+from datetime import datetime
+from pydantic import PositiveInt, constr
+from enum import Enum
+from typing import Optional
+
+from .base_schemas import (
+    SchemaOut,
+    SchemaToDB,
+    SchemaFromDB,
+    SchemaUpdate
+)
+
+
+key_str = constr(max_length=64)
+file_id_str = constr(max_length=255)
+
+
+class MediaKindSchema(str, Enum):
+    VOICE = "voice"
+
+
+class MediaFileSchemaOut(SchemaOut):
+    id: PositiveInt
+    key: key_str
+    kind: MediaKindSchema
+    file_id: file_id_str
+
+class MediaFileSchemaFromDB(SchemaFromDB, MediaFileSchemaOut):
+    created_at: datetime
+
+class MediaFileSchemaToDB(SchemaToDB):
+    key: key_str
+    kind: MediaKindSchema = MediaKindSchema.VOICE
+    file_id: file_id_str
+
+class MediaFileSchemaUpdate(SchemaUpdate):
+    file_id: Optional[file_id_str] = None
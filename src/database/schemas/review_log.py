@@ -0,0 +1,49 @@
+from datetime import datetime
+from pydantic import PositiveInt, conint
+from typing import Optional
+
+from .base_schemas import (
+    SchemaOut,
+    SchemaToDB,
+    SchemaFromDB,
+    SchemaUpdate
+)
+
+
+quality_int = conint(ge=0, le=5)
+
+
+class ReviewLogSchemaOut(SchemaOut):
+    id: PositiveInt
+    user_id: PositiveInt
+    flashcard_id: PositiveInt
+    word_id: PositiveInt
+    quality: quality_int
+    elapsed_ms: Optional[int]
+    previous_interval: int
+    previous_hardness: float
+    previous_repetitions: int
+    interval: int
+    hardness: float
+    repetitions: int
+    reviewed_at: datetime
+
+class ReviewLogSchemaFromDB(SchemaFromDB, ReviewLogSchemaOut):
+    pass
+
+class ReviewLogSchemaToDB(SchemaToDB):
+    user_id: PositiveInt
+    flashcard_id: PositiveInt
+    word_id: PositiveInt
+    quality: quality_int
+    elapsed_ms: Optional[int] = None
+    previous_interval: int
+    previous_hardness: float
+    previous_repetitions: int
+    interval: int
+    hardness: float
+    repetitions: int
+    reviewed_at: datetime
+
+class ReviewLogSchemaUpdate(SchemaUpdate):
+    elapsed_ms: Optional[int] = None
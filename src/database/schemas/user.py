@@ -1,7 +1,8 @@
 from datetime import datetime
-from pydantic import PositiveInt, constr
+from pydantic import PositiveInt, constr, AfterValidator
 from enum import Enum
-from typing import Optional
+from typing import Optional, Annotated
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from .base_schemas import (
     SchemaOut,
@@ -17,6 +18,17 @@ username_str = constr(min_length=5, max_length=32)
 name = constr(max_length=255)
 
 
+def validate_timezone(value: str) -> str:
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {value}")
+    return value
+
+
+timezone_name = Annotated[constr(max_length=64), AfterValidator(validate_timezone)]
+
+
 class UserStatusSchema(str, Enum):
     ACTIVE = "active"
     BLOCKED = "blocked"
@@ -29,6 +41,7 @@ class UserSchemaOut(SchemaOut):
     language: Optional[Languages]
     english_level: Optional[EnglishLevel]
     notifications_per_day: Optional[int]
+    timezone: Optional[timezone_name]
 
 
 class UserSchemaFromDB(SchemaFromDB, UserSchemaOut):
@@ -49,6 +62,7 @@ class UserSchemaToDB(SchemaToDB):
     language: Optional[Languages] = None
     english_level: Optional[EnglishLevel] = None
     notifications_per_day: Optional[int] = None
+    timezone: Optional[timezone_name] = None
     status: UserStatusSchema = UserStatusSchema.ACTIVE
 
 
@@ -60,4 +74,5 @@ class UserSchemaUpdate(SchemaUpdate):
     language: Optional[Languages] = None
     english_level: Optional[EnglishLevel] = None
     notifications_per_day: Optional[int] = None
+    timezone: Optional[timezone_name] = None
     status: Optional[UserStatusSchema] = None
@@ -27,9 +27,9 @@ class WordSchemaFromDB(SchemaFromDB, WordSchemaOut):
     created_at: datetime
 
 class WordSchemaToDB(SchemaToDB):
-    text: str
-    translation: str
-    example: Optional[str] = None
+    text: constr(strip_whitespace=True, min_length=1, max_length=128)
+    translation: constr(strip_whitespace=True, min_length=1, max_length=256)
+    example: Optional[constr(strip_whitespace=True, max_length=512)] = None
     level: EnglishLevel
 
 class WordSchemaUpdate(SchemaUpdate):
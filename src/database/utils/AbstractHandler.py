@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Dict, Any, Sequence
 from sqlalchemy import func
 
 from src.database.schemas.base_schemas import *
@@ -32,6 +32,21 @@ class AbstractHandler(ABC):
     async def add_one(uow: IUnitOfWork, data: SchemaToDB) -> int:
         pass
 
+    @staticmethod
+    @abstractmethod
+    async def add_many(uow: IUnitOfWork, data: Sequence[SchemaToDB]) -> List[int]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    async def upsert_many(uow: IUnitOfWork, data: Sequence[SchemaToDB], **kwargs) -> List[int]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    async def update_many(uow: IUnitOfWork, data: Dict[Any, SchemaUpdate], key: str = "id") -> List[int]:
+        pass
+
     @staticmethod
     @abstractmethod
     async def enrich(*args, **kwargs) -> SchemaOut:
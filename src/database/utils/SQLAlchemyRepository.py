@@ -1,11 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict
-from sqlalchemy import insert, select, update, func, delete
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Sequence
+from sqlalchemy import insert, select, update, func, delete, values, column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.schemas.base_schemas import *
 
 
+MAX_QUERY_PARAMETERS = 32767  # bind parameters Postgres accepts in a single statement
+
+
+def group_rows(rows: List[Dict]) -> Dict[tuple, List[Dict]]:
+    """Groups rows by their set of columns, so each group can share one multi-row statement."""
+    groups: Dict[tuple, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups
+
+
+def chunk_rows(rows: List, parameters_per_row: int, max_parameters: int = MAX_QUERY_PARAMETERS) -> Iterator[List]:
+    size = max(max_parameters // max(parameters_per_row, 1), 1)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
 class AbstractRepository(ABC):
     @abstractmethod
     async def add_one(self, data: dict):
@@ -27,6 +46,78 @@ class SQLAlchemyRepository(AbstractRepository):
         res = await self.session.execute(stmt)
         return res.scalar_one()
 
+    async def add_many(self, data: Sequence[SchemaToDB]) -> List[int]:
+        """Inserts the rows with multi-row INSERTs, as few as the parameter limit allows. Returns the new ids."""
+        ids = []
+        for columns, rows in group_rows([item.model_dump(exclude_none=True) for item in data]).items():
+            # python-side defaults add parameters too, so budget for every column of the table
+            for chunk in chunk_rows(rows, len(self.model.c)):
+                res = await self.session.execute(insert(self.model).values(chunk).returning(self.model.c.id))
+                ids += res.scalars().all()
+        return ids
+
+    async def upsert_many(
+            self,
+            data: Sequence[SchemaToDB],
+            index_elements: Sequence[str],
+            update_columns: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """
+        Inserts the rows or, when a row with the same `index_elements` (a unique key) exists,
+        overwrites its `update_columns` (by default every given column but the key).
+        Rows repeating a key are collapsed to the last one. Returns the ids of inserted and updated rows.
+        Raises ValueError if a row does not set every key column.
+        """
+        unique = {}
+        for item in data:
+            row = item.model_dump(exclude_none=True)
+            missing = [name for name in index_elements if name not in row]
+            if missing:
+                raise ValueError(f"Cannot upsert into {self.model.name}: rows must set the key columns {missing}")
+            unique[tuple(row[name] for name in index_elements)] = row
+
+        ids = []
+        for columns, rows in group_rows(list(unique.values())).items():
+            to_update = update_columns if update_columns is not None else [
+                name for name in columns if name not in index_elements and name != "id"
+            ]
+            for chunk in chunk_rows(rows, len(self.model.c)):
+                stmt = pg_insert(self.model).values(chunk)
+                set_ = {name: stmt.excluded[name] for name in to_update}
+                if "updated_at" in self.model.c and set_:
+                    set_["updated_at"] = datetime.now()  # onupdate does not fire for ON CONFLICT
+                stmt = (stmt.on_conflict_do_update(index_elements=index_elements, set_=set_) if set_
+                        else stmt.on_conflict_do_nothing(index_elements=index_elements))
+                res = await self.session.execute(stmt.returning(self.model.c.id))
+                ids += res.scalars().all()
+        return ids
+
+    async def edit_many(self, data: Dict[Any, SchemaUpdate], key: str = "id") -> List[int]:
+        """
+        Applies a different update to every row: `data` maps the `key` column value to the row's update.
+        Each chunk is one UPDATE ... FROM (VALUES ...) joined on `key`. Returns the ids of updated rows.
+        """
+        rows = []
+        for key_value, item in data.items():
+            row = item.model_dump(exclude_none=True)
+            if row:
+                rows.append({key: key_value, **row})
+
+        ids = []
+        for columns, group in group_rows(rows).items():
+            changed = [name for name in columns if name != key]
+            for chunk in chunk_rows(group, len(columns) + 1):  # + onupdate values
+                source = values(
+                    *(column(name, self.model.c[name].type) for name in columns), name="source"
+                ).data([tuple(row[name] for name in columns) for row in chunk])
+                stmt = (update(self.model)
+                        .where(self.model.c[key] == source.c[key])
+                        .values({name: source.c[name] for name in changed})
+                        .returning(self.model.c.id))
+                res = await self.session.execute(stmt)
+                ids += res.scalars().all()
+        return ids
+
     async def edit_one(self, data: SchemaUpdate, **filter_by) -> int:
         stmt = (update(self.model).values(**data.model_dump(exclude_none=True))
                 .filter_by(**filter_by).returning(self.model.c.id))
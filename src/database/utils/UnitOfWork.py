@@ -1,4 +1,6 @@
+import inspect
 from abc import ABC, abstractmethod
+from typing import Callable, Any, List
 
 from src.database.database import async_session_maker
 from src.database.repository import *
@@ -28,22 +30,69 @@ class IUnitOfWork(ABC):
 
 
 class UnitOfWork(IUnitOfWork):
+    """
+    The session and the repositories are created on first access, so updates that never
+    touch the database do not check out a connection. Commit and rollback are skipped
+    when no transaction was started.
+
+    Callbacks registered with `after_commit` run once the commit succeeded (e.g. cache
+    invalidation, so no reader can cache the old row again after it) and are discarded
+    on rollback.
+    """
+    repositories = {
+        "user": UserRepository,
+        "word": WordRepository,
+        "flashcard": FlashcardRepository,
+        "media_file": MediaFileRepository,
+        "review_log": ReviewLogRepository,
+    }
+
     def __init__(self):
         self.session_factory = async_session_maker
+        self._session = None
+        self._after_commit: List[Callable[[], Any]] = []
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        # called only for attributes that are not set yet, i.e. repositories not created so far
+        repository = self.repositories.get(name)
+        if repository is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self.__dict__[name] = repository(self.session)
+        return self.__dict__[name]
 
     async def __aenter__(self):
-        self.session = self.session_factory()
+        return self
 
-        self.user = UserRepository(self.session)
-        self.word = WordRepository(self.session)
-        self.flashcard = FlashcardRepository(self.session)
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Registers a function or coroutine function to call after the next successful commit."""
+        self._after_commit.append(callback)
 
     async def __aexit__(self, *args):
+        self._after_commit.clear()
+        if self._session is None:
+            return
         await self.rollback()
-        await self.session.close()
+        await self._session.close()
+        self._session = None
+        for name in self.repositories:
+            self.__dict__.pop(name, None)
 
     async def commit(self):
-        await self.session.commit()
+        if self._session is not None and self._session.in_transaction():
+            await self._session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
 
     async def rollback(self):
-        await self.session.rollback()
+        self._after_commit.clear()
+        if self._session is not None and self._session.in_transaction():
+            await self._session.rollback()
@@ -1,6 +1,12 @@
 import logging
 
 from src.services.LoggerService import LoggerService
+from src.services.HttpClient import HttpClient
+from src.services.AudioCache import AudioCache
+from src.services.ReviewLogWriter import ReviewLogWriter
 
 
 logger = LoggerService("main", logging.DEBUG)
+http_client = HttpClient()
+audio_cache = AudioCache(http_client=http_client)
+review_log_writer = ReviewLogWriter()
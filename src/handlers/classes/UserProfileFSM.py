@@ -8,7 +8,8 @@ from aiogram.fsm.state import State
 from src.database.handlers import Handlers
 from src.database.schemas import UserSchemaFromDB, Languages, UserSchemaUpdate, EnglishLevel
 from src.database.utils.UnitOfWork import UnitOfWork
-from src.keyboards.inline import get_level_inline, get_notification_frequency_inline, get_language_inline
+from src.keyboards.inline import get_level_inline, get_notification_frequency_inline, get_language_inline, \
+    pack_inline_markup, unpack_inline_markup
 from src.messages.user import choose_language, language_setting, choose_level, \
     choose_notification_frequency, level_setting, notification_setting, get_start_message
 from src.states.user import UserProfileState
@@ -32,10 +33,11 @@ class UserProfileFSM:
         self.logger = logger
 
     @staticmethod
-    async def add_last_message(state: FSMContext, last_message: str, last_message_reply_markup: InlineKeyboardMarkup) -> None:
+    async def add_last_message(state: FSMContext, last_message: str, last_message_reply_markup: InlineKeyboardMarkup = None) -> None:
+        # the markup is stored packed, so the state data stays JSON-serializable for the Redis storage
         await state.update_data({
             "last_message": last_message,
-            "last_message_reply_markup": last_message_reply_markup
+            "last_message_reply_markup": pack_inline_markup(last_message_reply_markup)
         })
 
     async def fill_profile(self, message: Message, state: FSMContext, user: UserSchemaFromDB) -> None:
@@ -111,7 +113,7 @@ class UserProfileFSM:
                                 reply_markup=None)
             # Sending the last message
             data = await state.get_data()
-            await callback.message.answer(data.get("last_message"), reply_markup=data.get("last_message_reply_markup"))
+            await callback.message.answer(data.get("last_message"), reply_markup=unpack_inline_markup(data.get("last_message_reply_markup")))
             await self.__handle_next_state(state)
 
         value = callback.data.split("_")[1]
@@ -130,7 +132,7 @@ class UserProfileFSM:
     @staticmethod
     async def __send_last_message(self, message: Message, state: FSMContext) -> None:
         data = await state.get_data()
-        await message.answer(data.get("last_message"), reply_markup=data.get("last_message_reply_markup"))
+        await message.answer(data.get("last_message"), reply_markup=unpack_inline_markup(data.get("last_message_reply_markup")))
 
     async def __handle_next_state(self, state: FSMContext) -> None:
         next_state = await self.__get_next_state(state)
@@ -1,31 +1,26 @@
-import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy import func, and_
-import aiohttp
-import os
-from pathlib import Path
 
 from aiogram import Dispatcher, Bot, F
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery, FSInputFile, InlineKeyboardMarkup, InlineKeyboardButton, Voice
+from aiogram.types import Message, CallbackQuery, FSInputFile, InlineKeyboardMarkup, Voice
 from aiogram.filters import Command
 from aiogram.utils.formatting import Spoiler
-from typing import Optional
+from typing import Optional, Tuple
 
 from database.schemas.flashcard import FlashcardSchemaUpdate
 from src.database.exceptions import NotFoundError
 from src.database.handlers import Handlers
 from src.database.handlers.word import WordHandler
-from src.database.models import Models
 from src.database.utils.UnitOfWork import UnitOfWork
 from src.database.schemas import (
     UserSchemaToDB, Languages, UserSchemaFromDB, FlashcardSchemaToDB,
-    WordSchemaFromDB, UserSchemaUpdate, EnglishLevel
+    WordSchemaFromDB, UserSchemaUpdate, UserStatusSchema, EnglishLevel, MediaFileSchemaToDB
 )
 from src.handlers.classes import user_profile_fsm
 from src.keyboards.inline import (
     get_settings_inline, get_word_inline, get_main_menu_inline, get_level_inline,
-    get_notification_frequency_inline, get_word_review_inline
+    get_notification_frequency_inline, get_word_review_inline, get_learned_page_inline, get_word_rating_inline
 )
 from src.messages.user import (
     choose_language, choose_level, choose_notification_frequency, get_settings_text, get_start_message, 
@@ -34,38 +29,16 @@ from src.messages.user import (
 from src.states.user import UserProfileState
 from src.utils.utils import get_next_level, is_profile_complete
 from src.services.spaced_repetition import SpacedRepetition
-from src.dependencies import logger
+from src.dependencies import logger, audio_cache, review_log_writer
 
 
-# Создаем директорию для аудио файлов, если её нет
-AUDIO_DIR = Path("media/audio")
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-
-async def get_word_audio(word: str) -> Optional[str]:
-    """
-    Получает аудио файл для слова используя Google Text-to-Speech API
-    """
-    try:
-        # Здесь можно использовать различные API для получения аудио
-        # Например, Google Text-to-Speech, Amazon Polly, или другие
-        # Для примера используем простой URL с Google TTS
-        url = f"https://translate.google.com/translate_tts?ie=UTF-8&q={word}&tl=en&client=tw-ob"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    audio_path = AUDIO_DIR / f"{word}.mp3"
-                    with open(audio_path, "wb") as f:
-                        f.write(await response.read())
-                    return str(audio_path)
-    except Exception as e:
-        print(f"Error getting audio for word {word}: {e}")
-        return None
-
 async def start(message: Message, state: FSMContext, uow: UnitOfWork):
     telegram_id = message.from_user.id
-    user: Optional[UserSchemaFromDB] = await Handlers.handle_not_found_error(Handlers.user.get_one(uow, id=telegram_id))
+    user: Optional[UserSchemaFromDB] = await Handlers.handle_not_found_error(Handlers.user.get_cached(uow, telegram_id))
     if user:
+        if user.status == UserStatusSchema.BLOCKED:
+            # пользователь снова запустил бота — возобновляем уведомления
+            await Handlers.user.update_one(uow, UserSchemaUpdate(status=UserStatusSchema.ACTIVE), id=telegram_id)
         language = user.language if user.language else Languages.ENGLISH
         await message.answer(get_start_message(language))
         # video = FSInputFile("media/video/instruction.mp4")
@@ -90,10 +63,8 @@ async def start(message: Message, state: FSMContext, uow: UnitOfWork):
 async def profile(message: Message, uow: UnitOfWork, user: UserSchemaFromDB):
     """Показывает профиль пользователя с основной информацией и статистикой"""
     # Получаем статистику по карточкам
-    _error_handler = Handlers.handle_not_found_error
-    all_flashcards = await _error_handler(Handlers.flashcard.get_all(uow, user_id=user.id), return_if_err=[])
-    learning_words = [fc for fc in all_flashcards if not fc.learned]
-    learned_words = [fc for fc in all_flashcards if fc.learned]
+    stats = await Handlers.flashcard.get_stats(uow, user_id=user.id)
+    levels_text = " | ".join(f"{level.value}: {count}" for level, count in sorted(stats.by_level.items()))
     
     # Формируем сообщение в зависимости от языка
     if user.language == Languages.RUSSIAN:
@@ -105,9 +76,11 @@ async def profile(message: Message, uow: UnitOfWork, user: UserSchemaFromDB):
             f"📚 Уровень: {user.english_level.value}\n"
             f"🔔 Уведомления: {user.notifications_per_day} раз в день\n\n"
             f"📊 <b>Статистика</b>\n"
-            f"📖 Всего слов: {len(all_flashcards)}\n"
-            f"📚 В процессе изучения: {len(learning_words)}\n"
-            f"✅ Выучено слов: {len(learned_words)}\n"
+            f"📖 Всего слов: {stats.total}\n"
+            f"📚 В процессе изучения: {stats.learning}\n"
+            f"✅ Выучено слов: {stats.learned}\n"
+            f"⏰ К повторению сегодня: {stats.due}\n"
+            f"📈 По уровням: {levels_text or '-'}\n"
         )
     else:
         profile_text = (
@@ -118,59 +91,80 @@ async def profile(message: Message, uow: UnitOfWork, user: UserSchemaFromDB):
             f"📚 Level: {user.english_level.value}\n"
             f"🔔 Notifications: {user.notifications_per_day} times per day\n\n"
             f"📊 <b>Statistics</b>\n"
-            f"📖 Total words: {len(all_flashcards)}\n"
-            f"📚 Learning: {len(learning_words)}\n"
-            f"✅ Learned: {len(learned_words)}\n"
+            f"📖 Total words: {stats.total}\n"
+            f"📚 Learning: {stats.learning}\n"
+            f"✅ Learned: {stats.learned}\n"
+            f"⏰ Due today: {stats.due}\n"
+            f"📈 By level: {levels_text or '-'}\n"
         )
     
     await message.answer(profile_text, reply_markup=get_main_menu_inline(user.language))
 
 
+LEARNED_PAGE_SIZE = 10
+
+
+async def get_learned_page(
+        uow: UnitOfWork,
+        user: UserSchemaFromDB,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None
+) -> Optional[Tuple[str, Optional[InlineKeyboardMarkup]]]:
+    """Формирует текст и клавиатуру одной страницы выученных слов"""
+    _error_handler = Handlers.handle_not_found_error
+    page = await _error_handler(Handlers.flashcard.get_enriched_page(
+        uow, LEARNED_PAGE_SIZE, after_id=after_id, before_id=before_id, user_id=user.id, learned=True
+    ))
+    if not page:
+        return None
+    learned_flashcards, has_more = page
+
+    # Есть ли страницы в обратном направлении
+    if before_id is not None:
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = after_id is not None, has_more
+
+    if user.language == Languages.RUSSIAN:
+        header = "📚 <b>Выученные слова:</b>\n\n"
+    else:
+        header = "📚 <b>Learned words:</b>\n\n"
+
+    words_text = "".join(f"• <b>{fc.word.text}</b> - {fc.word.translation}\n" for fc in learned_flashcards)
+    keyboard = get_learned_page_inline(
+        user.language, learned_flashcards[0].id, learned_flashcards[-1].id, has_prev, has_next
+    )
+    return header + words_text, keyboard
+
+
 async def show_learned_words(message: Message, uow: UnitOfWork, user: UserSchemaFromDB):
-    """Показывает список выученных слов"""
-    learned_flashcards = await Handlers.flashcard.get_all(uow, user_id=user.id, learned=True)
+    """Показывает первую страницу выученных слов"""
+    page = await get_learned_page(uow, user)
     
-    if not learned_flashcards:
+    if not page:
         if user.language == Languages.RUSSIAN:
             await message.answer("У вас пока нет выученных слов. Продолжайте учиться! 📚")
         else:
             await message.answer("You don't have any learned words yet. Keep learning! 📚")
         return
     
-    # Получаем информацию о словах
-    learned_words = []
-    for fc in learned_flashcards:
-        word = await Handlers.word.get_one(uow, id=fc.word_id)
-        learned_words.append(word)
-    
-    # Формируем сообщение
-    if user.language == Languages.RUSSIAN:
-        header = "📚 <b>Выученные слова:</b>\n\n"
+    text, keyboard = page
+    await message.answer(text, reply_markup=keyboard)
+
+
+async def learned_page_callback(callback: CallbackQuery, uow: UnitOfWork, user: UserSchemaFromDB):
+    """Листает страницы выученных слов в том же сообщении"""
+    direction, cursor = callback.data.split("_")[2:]
+    cursor = int(cursor)
+    if direction == "next":
+        page = await get_learned_page(uow, user, after_id=cursor)
     else:
-        header = "📚 <b>Learned words:</b>\n\n"
-    
-    words_text = ""
-    for i, word in enumerate(learned_words, 1):
-        words_text += f"{i}. <b>{word.text}</b> - {word.translation}\n"
+        page = await get_learned_page(uow, user, before_id=cursor)
     
-    # Разбиваем сообщение на части, если оно слишком длинное
-    max_length = 4000
-    messages = []
-    current_message = header
-    
-    for line in words_text.split('\n'):
-        if len(current_message) + len(line) + 1 > max_length:
-            messages.append(current_message)
-            current_message = line + '\n'
-        else:
-            current_message += line + '\n'
-    
-    if current_message:
-        messages.append(current_message)
-    
-    # Отправляем сообщения
-    for msg in messages:
-        await message.answer(msg)
+    if page:
+        text, keyboard = page
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
 
 
 async def support(message: Message, bot: Bot):
@@ -236,16 +230,14 @@ async def settings_back_callback(callback: CallbackQuery, state: FSMContext, uow
 
 async def next_word(message: Message, state: FSMContext, uow: UnitOfWork, user: UserSchemaFromDB):
     """Получает следующее слово для изучения"""
-    # Получаем все карточки пользователя
-    all_flashcards = await Handlers.flashcard.get_all(uow, user_id=user.id)
-    all_used_word_ids = [flashcard.word_id for flashcard in all_flashcards]
-    
-    # Получаем слова, которые пользователь еще не изучал
-    _filter = Models.word.c.id.notin_(all_used_word_ids)
-    all_words = await Handlers.word.get_all(uow, _filter=_filter, level=user.english_level)
+    # Выбираем случайное слово, которое пользователь еще не изучал
+    _error_handler = Handlers.handle_not_found_error
+    random_word: Optional[WordSchemaFromDB] = await _error_handler(
+        Handlers.word.get_random_unseen(uow, user_id=user.id, level=user.english_level)
+    )
     
     # Проверяем, есть ли слова для изучения на текущем уровне
-    if not all_words:
+    if not random_word:
         next_user_level = get_next_level(user.english_level)
         if not next_user_level:
             if user.language == Languages.RUSSIAN:
@@ -281,9 +273,6 @@ async def next_word(message: Message, state: FSMContext, uow: UnitOfWork, user:
         await next_word(message, state, uow, user)
         return
 
-    # Выбираем случайное слово
-    random_word: WordSchemaFromDB = random.choice(all_words)
-    
     # Создаем карточку для пользователя
     initial_interval, initial_ease, initial_reps, next_review = SpacedRepetition.get_initial_values()
     new_flashcard = FlashcardSchemaToDB(
@@ -303,6 +292,7 @@ async def review_word(callback: CallbackQuery, uow: UnitOfWork, user: UserSchema
     """Показывает перевод слова для повторения"""
     word_id = int(callback.data.split("_")[1])
     word = await Handlers.word.get_one(uow, id=word_id)
+    flashcard = await Handlers.flashcard.get_one(uow, user_id=user.id, word_id=word_id)
     
     if user.language == Languages.RUSSIAN:
         text = (
@@ -319,32 +309,53 @@ async def review_word(callback: CallbackQuery, uow: UnitOfWork, user: UserSchema
             f"Rate how well you know this word:"
         )
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="5️⃣", callback_data=f"rate_5_{word_id}"),
-            InlineKeyboardButton(text="4️⃣", callback_data=f"rate_4_{word_id}"),
-            InlineKeyboardButton(text="3️⃣", callback_data=f"rate_3_{word_id}"),
-        ],
-        [
-            InlineKeyboardButton(text="2️⃣", callback_data=f"rate_2_{word_id}"),
-            InlineKeyboardButton(text="1️⃣", callback_data=f"rate_1_{word_id}"),
-            InlineKeyboardButton(text="0️⃣", callback_data=f"rate_0_{word_id}"),
-        ]
-    ])
+    keyboard = get_word_rating_inline(word_id, flashcard.repetitions)
     
     await callback.message.edit_text(text, reply_markup=keyboard)
 
+
+def parse_expected_repetitions(parts: list, index: int) -> Optional[int]:
+    """Число повторений из данных кнопки (нет у кнопок, отправленных до его добавления)"""
+    return int(parts[index]) if len(parts) > index else None
+
+
+async def answer_already_counted(callback: CallbackQuery, user: UserSchemaFromDB):
+    if user.language == Languages.RUSSIAN:
+        await callback.answer("Ответ уже засчитан")
+    else:
+        await callback.answer("This answer has already been counted")
+
+
+def get_elapsed_ms(message: Message) -> Optional[int]:
+    """
+    Время с момента показа карточки (отправки или последнего редактирования сообщения).
+    None, если сообщение недоступно (InaccessibleMessage).
+    """
+    if not isinstance(message, Message):
+        return None
+    # edit_date приходит как Unix-время, date - уже как datetime
+    shown_at = datetime.fromtimestamp(message.edit_date, timezone.utc) if message.edit_date else message.date
+    return int((datetime.now(timezone.utc) - shown_at).total_seconds() * 1000)
+
+
 async def process_word_rating(callback: CallbackQuery, uow: UnitOfWork, user: UserSchemaFromDB):
     """Обрабатывает оценку знания слова"""
-    _, rating, word_id = callback.data.split("_")
-    rating = int(rating)
-    word_id = int(word_id)
+    parts = callback.data.split("_")
+    rating = int(parts[1])
+    word_id = int(parts[2])
     
-    # Получаем карточку
-    flashcard = await Handlers.flashcard.get_one(uow, word_id=word_id, user_id=user.id)
-    
-    # Обновляем параметры карточки
-    updated_card = await Handlers.flashcard.process_answer(uow, flashcard.id, rating)
+    # Обновляем параметры карточки, запись в журнал повторений уходит в фоновый буфер
+    # только после коммита; повторное нажатие не находит карточку с прежним числом повторений
+    result = await Handlers.handle_not_found_error(Handlers.flashcard.process_answer(
+        uow, user.id, word_id, rating,
+        expected_repetitions=parse_expected_repetitions(parts, 3),
+        elapsed_ms=get_elapsed_ms(callback.message)
+    ))
+    if result is None:
+        await answer_already_counted(callback, user)
+        return
+    updated_card, review = result
+    uow.after_commit(lambda: review_log_writer.add(review))
     
     # Формируем сообщение об успехе
     if user.language == Languages.RUSSIAN:
@@ -368,15 +379,27 @@ async def listen_word(callback: CallbackQuery, uow: UnitOfWork, user: UserSchema
     word_id = int(callback.data.split("_")[1])
     word = await Handlers.word.get_one(uow, id=word_id)
     
+    # Повторная отправка по file_id не требует ни диска, ни TTS
+    caption = f"🔊 {word.text}"
+    audio_key = audio_cache.key(word.text)
+    file_id = audio_cache.get_file_id(word.text)
+    if not file_id:
+        file_id = await Handlers.handle_not_found_error(Handlers.media_file.get_file_id(uow, key=audio_key))
+    if file_id:
+        audio_cache.set_file_id(word.text, file_id)
+        await callback.message.answer_voice(voice=file_id, caption=caption)
+        return
+
     # Получаем аудио файл
-    audio_path = await get_word_audio(word.text)
+    audio_path = await audio_cache.get_path(word.text)
     if audio_path:
-        await callback.message.answer_voice(
+        sent = await callback.message.answer_voice(
             voice=FSInputFile(audio_path),
-            caption=f"🔊 {word.text}"
+            caption=caption
         )
-        # Удаляем временный файл
-        os.remove(audio_path)
+        if sent.voice:
+            audio_cache.set_file_id(word.text, sent.voice.file_id)
+            await Handlers.media_file.add_one(uow, MediaFileSchemaToDB(key=audio_key, file_id=sent.voice.file_id))
     else:
         if user.language == Languages.RUSSIAN:
             await callback.answer("❌ Не удалось получить аудио для этого слова")
@@ -385,13 +408,20 @@ async def listen_word(callback: CallbackQuery, uow: UnitOfWork, user: UserSchema
 
 async def skip_word(callback: CallbackQuery, uow: UnitOfWork, user: UserSchemaFromDB):
     """Пропускает текущее слово"""
-    word_id = int(callback.data.split("_")[1])
-    
-    # Получаем карточку
-    flashcard = await Handlers.flashcard.get_one(uow, word_id=word_id, user_id=user.id)
+    parts = callback.data.split("_")
+    word_id = int(parts[1])
     
-    # Обновляем параметры карточки
-    await Handlers.flashcard.process_answer(uow, flashcard.id, 0)  # 0 - не знаю
+    # Обновляем параметры карточки, запись в журнал - после коммита
+    result = await Handlers.handle_not_found_error(Handlers.flashcard.process_answer(  # 0 - не знаю
+        uow, user.id, word_id, 0,
+        expected_repetitions=parse_expected_repetitions(parts, 2),
+        elapsed_ms=get_elapsed_ms(callback.message)
+    ))
+    if result is None:
+        await answer_already_counted(callback, user)
+        return
+    _, review = result
+    uow.after_commit(lambda: review_log_writer.add(review))
     
     if user.language == Languages.RUSSIAN:
         await callback.answer("⏩ Слово пропущено")
@@ -423,4 +453,5 @@ def register_handlers(dp: Dispatcher):
     dp.callback_query.register(review_word, F.data.startswith("review_"))
     dp.callback_query.register(process_word_rating, F.data.startswith("rate_"))
     dp.callback_query.register(listen_word, F.data.startswith("listen_"))
-    dp.callback_query.register(skip_word, F.data.startswith("skip_"))
\ No newline at end of file
+    dp.callback_query.register(skip_word, F.data.startswith("skip_"))
+    dp.callback_query.register(learned_page_callback, F.data.startswith("learned_page_"))
\ No newline at end of file
@@ -0,0 +1,28 @@
+import sys
+import os
+import asyncio
+import argparse
+from pathlib import Path
+
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+sys.path.append(os.path.join(os.getcwd()))
+
+from src.services.VocabularyImporter import VocabularyImporter
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import a word list (CSV or JSON lines) into the word table.")
+    parser.add_argument("path", type=Path, help="file with text, translation, example and level fields")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows sent to the database per COPY")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    stats = await VocabularyImporter(batch_size=args.batch_size).run(args.path)
+    print(", ".join(f"{name}: {value}" for name, value in stats.items()))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+from typing import Optional
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from src.database.schemas import Languages, EnglishLevel
@@ -149,8 +150,8 @@ def get_main_menu_inline(lan: Languages) -> InlineKeyboardMarkup:
     ])
 
 
-def get_word_review_inline(lan: Languages, word_id: int) -> InlineKeyboardMarkup:
-    """Создает клавиатуру для повторения слова"""
+def get_word_review_inline(lan: Languages, word_id: int, repetitions: int = 0) -> InlineKeyboardMarkup:
+    """Создает клавиатуру для повторения слова (repetitions - число повторений карточки на момент показа)"""
     match lan:
         case Languages.RUSSIAN:
             review = "📝 Проверить знание"
@@ -168,7 +169,21 @@ def get_word_review_inline(lan: Languages, word_id: int) -> InlineKeyboardMarkup
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text=review, callback_data=f"review_{word_id}")],
         [InlineKeyboardButton(text=listen, callback_data=f"listen_{word_id}")],
-        [InlineKeyboardButton(text=skip, callback_data=f"skip_{word_id}")],
+        [InlineKeyboardButton(text=skip, callback_data=f"skip_{word_id}_{repetitions}")],
+    ])
+
+
+def get_word_rating_inline(word_id: int, repetitions: int) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру оценки знания слова.
+    Число повторений в данных кнопок не дает повторному нажатию засчитать ответ дважды.
+    """
+    def button(text: str, rating: int) -> InlineKeyboardButton:
+        return InlineKeyboardButton(text=text, callback_data=f"rate_{rating}_{word_id}_{repetitions}")
+
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [button("5️⃣", 5), button("4️⃣", 4), button("3️⃣", 3)],
+        [button("2️⃣", 2), button("1️⃣", 1), button("0️⃣", 0)],
     ])
 
 
@@ -178,4 +193,37 @@ def get_settings_inline(lan: Languages) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text=edit_button, callback_data="settings_edit")],
         [get_back_button(lan, "settings")]
-    ])
\ No newline at end of file
+    ])
+
+def get_learned_page_inline(lan: Languages, first_id: int, last_id: int, has_prev: bool, has_next: bool) -> Optional[InlineKeyboardMarkup]:
+    """Создает клавиатуру навигации по страницам выученных слов"""
+    match lan:
+        case Languages.RUSSIAN:
+            prev = "⬅️ Назад"
+            next_ = "Вперед ➡️"
+        case _:
+            prev = "⬅️ Previous"
+            next_ = "Next ➡️"
+
+    row = []
+    if has_prev:
+        row.append(InlineKeyboardButton(text=prev, callback_data=f"learned_page_prev_{first_id}"))
+    if has_next:
+        row.append(InlineKeyboardButton(text=next_, callback_data=f"learned_page_next_{last_id}"))
+    return InlineKeyboardMarkup(inline_keyboard=[row]) if row else None
+
+
+def pack_inline_markup(markup: Optional[InlineKeyboardMarkup]) -> Optional[list]:
+    """Compact JSON-friendly form of a callback-only keyboard: rows of [text, callback_data]"""
+    if markup is None:
+        return None
+    return [[[button.text, button.callback_data] for button in row] for row in markup.inline_keyboard]
+
+
+def unpack_inline_markup(packed: Optional[list]) -> Optional[InlineKeyboardMarkup]:
+    if packed is None:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=text, callback_data=callback_data) for text, callback_data in row]
+        for row in packed
+    ])
@@ -16,21 +16,36 @@ from config import (
     TELEGRAM_BOT_HOST,
     TELEGRAM_BOT_PORT,
     WEBHOOK_PATH,
+    METRICS_PATH,
     TELEGRAM_ADMIN_IDS
 )
 from src.services.Ngrok import Ngrok
+from src.services.FSMStorage import create_fsm_storage
+from src.services.RedisScheduler import RedisScheduler
+from src.services.Metrics import MetricsExporter
 from src.middlewares.UoWMiddleware import UoWMiddleware
 from src.middlewares.AntiFloodMiddleware import AntiFloodMiddleware
 from src.middlewares.AuthMiddleware import AuthMiddleware
 from src.utils.commands import set_commands
+from src.database.handlers import Handlers
 from src.handlers import *
-from src.dependencies import logger
+from src.dependencies import logger, http_client, audio_cache, review_log_writer
 
 
 app = web.Application()
 
 
 async def on_startup(bot: Bot) -> None:
+    # open the shared HTTP connection pool
+    await http_client.start()
+
+    # write review events in the background
+    await review_log_writer.start()
+
+    # follow user cache invalidations of the other replicas
+    if Handlers.user.redis_cache:
+        await Handlers.user.redis_cache.start(on_invalidate=Handlers.user.cache.invalidate)
+
     # set webhooks
     ngrok = Ngrok()
     urls = await ngrok.get_public_urls()
@@ -56,19 +71,27 @@ async def last_message(bot: Bot) -> None:
             pass
 
 
-async def on_shutdown(bot: Bot) -> None:
+async def on_shutdown(bot: Bot, dispatcher: Dispatcher) -> None:
     await last_message(bot)
+    await review_log_writer.close()
+    await audio_cache.close()
+    await http_client.close()
+    if Handlers.user.redis_cache:
+        await Handlers.user.redis_cache.close()
+    await dispatcher.storage.close()
     await bot.session.close()
 
 
 def main():
     default = DefaultBotProperties(parse_mode=ParseMode.HTML)
     bot = Bot(token=TOKEN_BOT, default=default)
-    dp = Dispatcher(bot=bot)
+    dp = Dispatcher(bot=bot, storage=create_fsm_storage())
     dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
 
     webhook_requests_handler = SimpleRequestHandler(dispatcher=dp, bot=bot)
     webhook_requests_handler.register(app, path=WEBHOOK_PATH)
+    app.router.add_get(METRICS_PATH, MetricsExporter(RedisScheduler()).handle)
     setup_application(app, dp, bot=bot)
 
     # dp.message.outer_middleware(AntiFloodMiddleware())
@@ -86,8 +109,6 @@ def main():
         web.run_app(app, host=TELEGRAM_BOT_HOST, port=TELEGRAM_BOT_PORT)
     except Exception as ex:
         asyncio.run(logger.critical(f"Exception: {ex}", exc_info=True))
-    finally:
-        asyncio.run(on_shutdown(bot))
 
 if __name__ == '__main__':
     main()
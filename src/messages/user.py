@@ -212,4 +212,18 @@ def get_settings_text(lan: Languages, level: EnglishLevel, notification: int) ->
             f"📚 <b>Level</b>   ---   {level.value}\n"
             f"🔔 <b>Notifications</b>   ---   {notification} per day"
         )
-    return text
\ No newline at end of file
+    return text
+
+def get_notification_message(lan: Languages) -> str:
+    match lan:
+        case Languages.RUSSIAN:
+            text = "🔔 Время повторить слова! Нажми /next_word, чтобы продолжить."
+        case _:
+            text = "🔔 Time to practise your words! Press /next_word to continue."
+    return text
+
+
+# Templates of scheduled messages: the task stores the name and the arguments, the text is rendered at send time
+task_templates = {
+    "notification": lambda lan: get_notification_message(Languages(lan) if lan else Languages.ENGLISH),
+}
@@ -34,7 +34,7 @@ class AuthMiddleware(BaseMiddleware):
         uow = data.get("uow")
         telegram_id = event.from_user.id
         not_found_err_handler = Handlers.handle_not_found_error
-        user: Optional[UserSchemaFromDB] = await not_found_err_handler(Handlers.user.get_one(uow, id=telegram_id))
+        user: Optional[UserSchemaFromDB] = await not_found_err_handler(Handlers.user.get_cached(uow, telegram_id))
         message = event if isinstance(event, Message) else event.message
         # if user does not exist -> run start command
         if not user: return await start(message, state=data["state"], uow=uow)
@@ -12,9 +12,10 @@ class UoWMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        self.uow = UnitOfWork()
-        async with self.uow:
-            data["uow"] = self.uow
+        # one unit of work per update; it opens a session only if a handler touches a repository
+        uow = UnitOfWork()
+        async with uow:
+            data["uow"] = uow
             result = await handler(event, data)
-            await self.uow.commit()
+            await uow.commit()
         return result
@@ -1,16 +1,35 @@
-from aiogram import Bot, Dispatcher
+import sys
+import os
+import asyncio
+from aiogram import Bot
+from aiogram.client.bot import DefaultBotProperties
+from aiogram.enums.parse_mode import ParseMode
 
-from config import TOKEN_BOT, REDIS_PORT, REDIS_HOST
-from services.RedisScheduler import RedisScheduler
-from services.TaskDispatcher import TaskDispatcher
 
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+sys.path.append(os.path.join(os.getcwd()))
 
-REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
+from config import TOKEN_BOT, REDIS_URL
+from src.services.RedisScheduler import RedisScheduler
+from src.services.TaskDispatcher import TaskDispatcher
+from src.services.NotificationPlanner import NotificationPlanner
 
-bot = Bot(token=TOKEN_BOT)
-dp = Dispatcher(bot=bot)
+
+bot = Bot(token=TOKEN_BOT, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 
 # Instantiate scheduler and dispatcher
 scheduler = RedisScheduler(REDIS_URL)
 dispatcher = TaskDispatcher(bot, scheduler, interval=60)
-dispatcher.start(dp)
+planner = NotificationPlanner(scheduler)
+
+
+async def main():
+    try:
+        await asyncio.gather(dispatcher.run(), planner.run())
+    finally:
+        await scheduler.close()
+        await bot.session.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
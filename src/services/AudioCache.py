@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+from cachetools import LRUCache
+
+from src.config import AUDIO_CACHE_DIRECTORY, AUDIO_CACHE_MAX_BYTES, AUDIO_FILE_ID_CACHE_SIZE
+from src.services.LoggerService import LoggerService
+from src.services.HttpClient import HttpClient
+
+
+class AudioCache:
+    """
+    Size-bounded on-disk cache of pronunciation clips.
+
+    Clips are content-addressed by the hash of the normalised word, evicted in LRU order
+    once the directory grows beyond `max_bytes`, and fetched at most once at a time per word:
+    concurrent requests for the same word wait for the download already in flight.
+    Telegram file_ids of the most recently used clips are remembered so repeat sends skip
+    the disk entirely. A client created here (none injected) is closed by `close`.
+    """
+
+    tts_url = "https://translate.google.com/translate_tts?ie=UTF-8&q={}&tl=en&client=tw-ob"
+
+    def __init__(
+            self,
+            directory: str = AUDIO_CACHE_DIRECTORY,
+            max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+            max_file_ids: int = AUDIO_FILE_ID_CACHE_SIZE,
+            http_client: HttpClient = None,
+            logger: LoggerService = LoggerService("audio_cache")
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.http_client = http_client if http_client else HttpClient()
+        self._owns_http_client = http_client is None
+        self.logger = logger
+
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key -> file size, least recently used first
+        self._size = 0
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._file_ids: LRUCache = LRUCache(maxsize=max_file_ids)
+        self.__load()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.strip().lower().encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def get_file_id(self, text: str) -> Optional[str]:
+        return self._file_ids.get(self.key(text))
+
+    def set_file_id(self, text: str, file_id: str) -> None:
+        self._file_ids[self.key(text)] = file_id
+
+    async def close(self) -> None:
+        if self._owns_http_client:
+            await self.http_client.close()
+
+    async def get_path(self, text: str) -> Optional[Path]:
+        """Returns the path of the cached clip, downloading it first if needed."""
+        key = self.key(text)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self.path(key)
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self.__fetch(text, key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def __fetch(self, text: str, key: str) -> Optional[Path]:
+        try:
+            status, content = await self.http_client.get(self.tts_url.format(quote(text)))
+            if status != 200:
+                self.logger.warning(f"TTS returned {status} for word {text}")
+                return None
+        except Exception as e:
+            await self.logger.error(f"Error getting audio for word {text}: {e}")
+            return None
+
+        path = self.path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self.__add(key, len(content))
+        return path
+
+    def __add(self, key: str, size: int) -> None:
+        self._size += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            old_key, old_size = self._entries.popitem(last=False)
+            self._size -= old_size
+            self.path(old_key).unlink(missing_ok=True)
+
+    def __load(self) -> None:
+        files = sorted(self.directory.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+        for file in files:
+            self.__add(file.stem, file.stat().st_size)
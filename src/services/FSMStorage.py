@@ -0,0 +1,22 @@
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.config import FSM_STORAGE, FSM_STATE_TTL, FSM_DATA_TTL, REDIS_URL
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    FSM storage chosen by FSM_STORAGE: "memory" (single process) or "redis" (shared by all
+    workers and kept across restarts; abandoned states and data expire after their TTL).
+    """
+    if FSM_STORAGE == "redis":
+        # needs the optional redis package, so it is imported only when configured
+        from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
+
+        return RedisStorage.from_url(
+            REDIS_URL,
+            key_builder=DefaultKeyBuilder(prefix="fsm"),
+            state_ttl=FSM_STATE_TTL,
+            data_ttl=FSM_DATA_TTL,
+        )
+    return MemoryStorage()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+from typing import Any, Optional, Tuple
+
+import aiohttp
+
+from src.config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_TIMEOUT,
+    HTTP_RETRIES,
+    HTTP_BACKOFF
+)
+from src.services.LoggerService import LoggerService
+
+
+class HttpClient:
+    """
+    Long-lived aiohttp session shared by every outbound HTTP call.
+
+    The connector keeps warm keep-alive connections (bounded overall and per host),
+    so DNS, TCP and TLS setup are paid once instead of per request. Network errors,
+    timeouts and 429/5xx responses are retried with exponential backoff.
+    """
+
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(
+            self,
+            limit: int = HTTP_POOL_LIMIT,
+            limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+            timeout: float = HTTP_TIMEOUT,
+            retries: int = HTTP_RETRIES,
+            backoff: float = HTTP_BACKOFF,
+            logger: LoggerService = LoggerService("http_client")
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.logger = logger
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self.logger.info("HTTP client started")
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self.logger.info("HTTP client closed")
+        self._session = None
+
+    async def request(self, method: str, url: str, **kwargs) -> Tuple[int, bytes]:
+        """
+        Sends a request and returns (status, body).
+        The last error is raised once all retries are exhausted.
+        """
+        await self.start()
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    body = await response.read()
+                    if response.status not in self.retry_statuses or last_attempt:
+                        return response.status, body
+                    self.logger.warning(f"{method} {url} returned {response.status}, retrying")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                self.logger.warning(f"{method} {url} failed: {e!r}, retrying")
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def get(self, url: str, **kwargs) -> Tuple[int, bytes]:
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        _, body = await self.get(url, **kwargs)
+        return json.loads(body)
@@ -0,0 +1,163 @@
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from aiohttp import web
+
+from src.database.database import get_pool_stats
+from src.services.RedisScheduler import RedisScheduler
+from src.services.RedisUserCache import REDIS_ERRORS
+from src.services.LoggerService import LoggerService
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_metric(name: str, kind: str, description: str, samples: Iterable[Tuple[str, float]]) -> List[str]:
+    """Lines of one metric in the Prometheus text format; a sample is (labels, value)."""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return lines
+
+
+class DispatcherMetrics:
+    """
+    Counters and the send latency histogram of a TaskDispatcher.
+
+    The dispatcher runs in its own process, so the values are accumulated in memory and
+    added to the shared 'metrics:dispatcher' Redis hash on `flush`, where the exporter of the
+    web process reads them. Several dispatchers add up to one set of totals.
+    """
+
+    key = "metrics:dispatcher"
+    counters = ("sent", "retries", "dead_lettered", "rate_limited", "errors")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.totals: Dict[str, float] = defaultdict(float)  # since the process start
+        self._pending: Dict[str, float] = defaultdict(float)  # not yet flushed to Redis
+
+    def inc(self, name: str, value: float = 1) -> None:
+        self.totals[name] += value
+        self._pending[name] += value
+
+    def observe_send(self, seconds: float) -> None:
+        for bucket in self.buckets:
+            if seconds <= bucket:
+                self.inc(f"latency_bucket:{bucket}")
+        self.inc("latency_count")
+        self.inc("latency_sum", seconds)
+
+    async def flush(self, redis) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(float)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for name, value in pending.items():
+                    if float(value).is_integer():
+                        pipe.hincrby(self.key, name, int(value))
+                    else:
+                        pipe.hincrbyfloat(self.key, name, value)
+                await pipe.execute()
+        except Exception:
+            # keep the values for the next flush, together with whatever was counted meanwhile
+            for name, value in pending.items():
+                self._pending[name] += value
+            raise
+
+
+class MetricsExporter:
+    """
+    Serves delivery and database pool metrics in the Prometheus text format.
+
+    Queue depth and schedule lag (how long the oldest due task has been waiting) are read from
+    the scheduler's keys on every scrape; dispatcher counters and the send latency histogram
+    come from DispatcherMetrics. Redis being unavailable only drops the Redis based metrics.
+    """
+
+    def __init__(
+            self,
+            scheduler: RedisScheduler,
+            buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+            logger: LoggerService = LoggerService("metrics")
+    ) -> None:
+        self.scheduler = scheduler
+        self.buckets = buckets
+        self.logger = logger
+
+    async def handle(self, request: web.Request) -> web.Response:
+        lines = []
+        try:
+            lines += await self.__scheduler_metrics()
+            lines += await self.__dispatcher_metrics()
+        except REDIS_ERRORS as e:
+            self.logger.warning(f"Redis is unavailable for metrics: {e!r}")
+        lines += self.__pool_metrics()
+        return web.Response(text="\n".join(lines) + "\n", content_type="text/plain", charset="utf-8")
+
+    async def __scheduler_metrics(self) -> List[str]:
+        scheduler = self.scheduler
+        if scheduler.redis is None:
+            await scheduler.connect()
+        redis = scheduler.redis
+        now = time.time()
+
+        processing_keys = list(await redis.smembers(scheduler.workers_key))
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(scheduler.tasks_key)
+            pipe.zcount(scheduler.tasks_key, "-inf", now)
+            pipe.zrange(scheduler.tasks_key, 0, 0, withscores=True)
+            pipe.zcard(scheduler.dead_key)
+            for processing_key in processing_keys:
+                pipe.zcard(processing_key)
+            queued, due, oldest, dead, *processing = await pipe.execute()
+
+        lag = max(now - oldest[0][1], 0.0) if oldest else 0.0
+        return [
+            *format_metric("scheduler_queue_depth", "gauge", "Tasks waiting in the queue.", [("", queued)]),
+            *format_metric("scheduler_due_tasks", "gauge", "Queued tasks whose send time has passed.", [("", due)]),
+            *format_metric(
+                "scheduler_lag_seconds", "gauge", "Time the oldest due task has been waiting.", [("", round(lag, 3))]
+            ),
+            *format_metric("scheduler_processing_tasks", "gauge", "Tasks claimed by workers.", [("", sum(processing))]),
+            *format_metric("scheduler_dead_letter_tasks", "gauge", "Tasks in the dead-letter set.", [("", dead)]),
+        ]
+
+    async def __dispatcher_metrics(self) -> List[str]:
+        values = await self.scheduler.redis.hgetall(DispatcherMetrics.key)
+        value = lambda name: float(values.get(name, 0))
+
+        lines = format_metric(
+            "dispatcher_messages_total", "counter", "Scheduled messages by outcome.",
+            [(f'outcome="{name}"', value(name)) for name in DispatcherMetrics.counters]
+        )
+        histogram = "dispatcher_send_latency_seconds"
+        lines += [f"# HELP {histogram} Duration of send_message calls.", f"# TYPE {histogram} histogram"]
+        lines += [f'{histogram}_bucket{{le="{bucket}"}} {value(f"latency_bucket:{bucket}")}' for bucket in self.buckets]
+        lines += [
+            f'{histogram}_bucket{{le="+Inf"}} {value("latency_count")}',
+            f"{histogram}_sum {value('latency_sum')}",
+            f"{histogram}_count {value('latency_count')}",
+        ]
+        return lines
+
+    @staticmethod
+    def __pool_metrics() -> List[str]:
+        stats = get_pool_stats()
+        return [
+            *format_metric(
+                "db_pool_connections", "gauge", "Database pool connections by state.",
+                [(f'state="{state}"', stats[state]) for state in ("checked_out", "idle", "overflow")]
+            ),
+            *format_metric("db_pool_checkouts_total", "counter", "Connection checkouts.", [("", stats["checkouts"])]),
+            *format_metric(
+                "db_pool_checkout_timeouts_total", "counter", "Checkouts that timed out.",
+                [("", stats["checkout_timeouts"])]
+            ),
+            *format_metric(
+                "db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection.",
+                [("", stats["checkout_wait_total"])]
+            ),
+        ]
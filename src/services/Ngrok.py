@@ -1,12 +1,12 @@
-import aiohttp
-
 from src.config import NGROK_API_KEY
-from src.dependencies import logger
+from src.dependencies import logger, http_client as shared_http_client
+from src.services.HttpClient import HttpClient
 
 
 class Ngrok:
-    def __init__(self):
+    def __init__(self, http_client: HttpClient = shared_http_client):
         self.endpoint = "https://api.ngrok.com/"
+        self.http_client = http_client
 
     async def get_tunnels(self):
         tunnels_endpoint = f"{self.endpoint}/tunnels"
@@ -15,9 +15,7 @@ class Ngrok:
             "Ngrok-Version": "2"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(tunnels_endpoint, headers=headers) as response:
-                data = await response.json()
+        data = await self.http_client.get_json(tunnels_endpoint, headers=headers)
 
         logger.debug(f"Ngrok tunnels: {data}")
         tunnels = data.get("tunnels", [])
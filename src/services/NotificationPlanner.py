@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from src.config import (
+    NOTIFICATION_DAY_START,
+    NOTIFICATION_DAY_END,
+    NOTIFICATION_PLAN_BATCH,
+    NOTIFICATION_PLAN_INTERVAL,
+    DEFAULT_TIMEZONE
+)
+from src.database.handlers import Handlers
+from src.database.schemas import UserSchemaFromDB
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.services.RedisScheduler import RedisScheduler
+from src.services.LoggerService import LoggerService
+
+
+class NotificationPlanner:
+    """
+    Turns users' notifications_per_day into scheduled tasks.
+
+    Each user gets N slots spread evenly over the waking hours (NOTIFICATION_DAY_START ..
+    NOTIFICATION_DAY_END) of the day in the user's timezone (DEFAULT_TIMEZONE if not set),
+    shifted by a per-user offset so that users do not all fire at the same second; slots
+    already in the past move to the next day.
+    The settings a plan was built from are kept as a fingerprint in the 'notifications:plan'
+    hash, so every pass only re-plans users whose settings (or day) changed, and the task ids
+    enqueued for a user are tracked in 'notifications:user:<id>' to replace them on change.
+    Tasks reference the "notification" template instead of carrying the message text.
+    Users are read in keyset batches and every batch is written in a single pipeline.
+    """
+
+    plan_key = "notifications:plan"
+
+    def __init__(
+            self,
+            scheduler: RedisScheduler,
+            logger: LoggerService = LoggerService("notification_planner"),
+            batch_size: int = NOTIFICATION_PLAN_BATCH,
+            interval: int = NOTIFICATION_PLAN_INTERVAL,
+            day_start: int = NOTIFICATION_DAY_START,
+            day_end: int = NOTIFICATION_DAY_END,
+            default_timezone: str = DEFAULT_TIMEZONE
+    ) -> None:
+        self.scheduler = scheduler
+        self.logger = logger
+        self.batch_size = batch_size
+        self.interval = interval
+        self.day_start = day_start
+        self.day_end = day_end
+        self.default_timezone = ZoneInfo(default_timezone)
+
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        return f"notifications:user:{user_id}"
+
+    def zone(self, user: UserSchemaFromDB) -> ZoneInfo:
+        return ZoneInfo(user.timezone) if user.timezone else self.default_timezone
+
+    @staticmethod
+    def fingerprint(user: UserSchemaFromDB, local_now: datetime) -> str:
+        return f"{local_now.date().isoformat()}:{local_now.tzinfo}:{user.notifications_per_day}:{user.language}"
+
+    def slots(self, user: UserSchemaFromDB, local_now: datetime) -> List[datetime]:
+        """The user's next notifications_per_day send times after `local_now` (aware, in the user's timezone)."""
+        day = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
+        span = (self.day_end - self.day_start) * 3600
+        step = span / user.notifications_per_day
+        offset = (user.id * 2654435761 % 1000) / 1000 * step  # stable per user, within one step
+
+        slots = []
+        for i in range(user.notifications_per_day):
+            slot = day + timedelta(seconds=self.day_start * 3600 + i * step + offset)
+            if slot <= local_now:
+                slot += timedelta(days=1)
+            slots.append(slot.astimezone(timezone.utc))
+        return slots
+
+    async def plan(self, now: Optional[datetime] = None) -> int:
+        """Re-plans users whose settings changed since the last pass. Returns the number of re-planned users."""
+        now = now.astimezone(timezone.utc) if now else datetime.now(timezone.utc)
+        if self.scheduler.redis is None:
+            await self.scheduler.connect()
+
+        planned, after_id = 0, None
+        while True:
+            async with UnitOfWork() as uow:
+                users = await Handlers.handle_not_found_error(
+                    Handlers.user.get_notifiable(uow, limit=self.batch_size, after_id=after_id), return_if_err=[]
+                )
+            if not users:
+                break
+            planned += await self.__plan_batch(users, now)
+            after_id = users[-1].id
+
+        if planned:
+            self.logger.info(f"Planned notifications for {planned} users")
+        return planned
+
+    async def __plan_batch(self, users: List[UserSchemaFromDB], now: datetime) -> int:
+        redis = self.scheduler.redis
+        local_now = {user.id: now.astimezone(self.zone(user)) for user in users}  # zone resolved once per user
+        fingerprints = {user.id: self.fingerprint(user, local_now[user.id]) for user in users}
+        old_fingerprints = await redis.hmget(self.plan_key, [user.id for user in users])
+        changed = [user for user, old in zip(users, old_fingerprints) if old != fingerprints[user.id]]
+        if not changed:
+            return 0
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for user in changed:
+                pipe.smembers(self.user_key(user.id))
+            old_members = await pipe.execute()
+
+        task_ids = iter(await self.scheduler.allocate_ids(sum(user.notifications_per_day for user in changed)))
+        tasks: Dict[str, Tuple[str, float]] = {}
+        async with redis.pipeline(transaction=False) as pipe:
+            for user, old_task_ids in zip(changed, old_members):
+                user_key = self.user_key(user.id)
+                self.scheduler.queue_removal(pipe, list(old_task_ids))
+                pipe.delete(user_key)
+
+                user_tasks = {
+                    next(task_ids): self.scheduler.encode_task(
+                        user.id, slot, template="notification", template_args={"lan": user.language}
+                    )
+                    for slot in self.slots(user, local_now[user.id])
+                }
+                pipe.sadd(user_key, *user_tasks)
+                pipe.expire(user_key, timedelta(days=2))
+                tasks.update(user_tasks)
+            self.scheduler.queue_tasks(pipe, tasks)
+            pipe.hset(self.plan_key, mapping={user.id: fingerprints[user.id] for user in changed})
+            await pipe.execute()
+        return len(changed)
+
+    async def run(self) -> None:
+        """Re-plan every `interval` seconds."""
+        while True:
+            try:
+                await self.plan()
+            except Exception as e:
+                await self.logger.error(f"Error in notification planner: {e}")
+            await asyncio.sleep(self.interval)
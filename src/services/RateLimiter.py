@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Dict, Hashable
+
+
+class TokenBucket:
+    """
+    Token bucket: at most `rate` acquisitions per second on average, bursts up to `capacity`.
+    Waiters are served one by one in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. after a flood-control answer)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # refill starts only when the pause ends, so no burst follows it
+        self._updated_at = self._paused_until
+        self._tokens = 0
+
+
+class KeyedRateLimiter:
+    """Allows one acquisition per `interval` seconds for every key (e.g. per chat)."""
+
+    def __init__(self, interval: float, max_keys: int = 100_000) -> None:
+        self.interval = interval
+        self.max_keys = max_keys
+        self._next_allowed: Dict[Hashable, float] = {}
+
+    async def acquire(self, key: Hashable) -> None:
+        now = time.monotonic()
+        if len(self._next_allowed) >= self.max_keys:
+            self._next_allowed = {k: t for k, t in self._next_allowed.items() if t > now}
+
+        allowed_at = max(now, self._next_allowed.get(key, now))
+        self._next_allowed[key] = allowed_at + self.interval
+        if allowed_at > now:
+            await asyncio.sleep(allowed_at - now)
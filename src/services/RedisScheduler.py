@@ -1,24 +1,116 @@
-import asyncio
 import json
-import logging
+import os
+import socket
+import time
 from datetime import datetime, timezone
+from typing import Optional, Tuple, List, Dict, Union
 
-from aiogram import Bot, Dispatcher, types
-from aiogram.utils import executor
 import aioredis
 
-from ..config import REDIS_HOST, REDIS_PORT
-from LoggerService import LoggerService
+from src.config import REDIS_URL, DEAD_LETTER_MAX
+from src.services.LoggerService import LoggerService
 
 
-def isoformat(dt: datetime) -> str:
-    """Convert datetime to ISO 8601 string in UTC."""
-    return dt.astimezone(timezone.utc).isoformat()
+Moment = Union[datetime, float]
 
 
-def parse_isoformat(s: str) -> datetime:
-    """Parse ISO 8601 string into a timezone-aware datetime."""
-    return datetime.fromisoformat(s)
+def to_score(moment: Moment) -> float:
+    """
+    UNIX timestamp with millisecond precision.
+    Aware datetimes are converted exactly, naive ones are taken as the server's local time
+    (what datetime.now() returns) and numbers are treated as UNIX timestamps.
+    """
+    if isinstance(moment, datetime):
+        moment = moment.astimezone(timezone.utc).timestamp()
+    return round(float(moment), 3)
+
+
+def now_score() -> float:
+    return round(time.time(), 3)
+
+
+def isoformat(moment: Moment) -> str:
+    """Convert datetime or UNIX timestamp to ISO 8601 string in UTC."""
+    return datetime.fromtimestamp(to_score(moment), timezone.utc).isoformat()
+
+
+def base36(number: int) -> str:
+    """Short text form of a task id."""
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        text = digits[remainder] + text
+        if not number:
+            return text
+
+
+# Moves at most ARGV[2] tasks with score <= ARGV[1] from the queue into the worker's
+# processing set, scored by their visibility deadline ARGV[3].
+CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    for _, member in ipairs(due) do
+        redis.call('ZADD', KEYS[2], ARGV[3], member)
+    end
+    redis.call('SADD', KEYS[3], KEYS[2])
+end
+return due
+"""
+
+# Returns tasks whose visibility deadline passed (the worker died or hung) to the queue.
+# An emptied processing set of another worker (ARGV[2] is the caller's) leaves the KEYS[3]
+# registry; a live worker is registered again by its next claim.
+REQUEUE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, member in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('ZADD', KEYS[2], ARGV[1], member)
+end
+if KEYS[1] ~= ARGV[2] and redis.call('ZCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[3], KEYS[1])
+end
+return #expired
+"""
+
+# Removes the worker's processing set from the registry on shutdown, unless it still holds
+# tasks (those return to the queue after their visibility timeout).
+UNREGISTER_SCRIPT = """
+if redis.call('ZCARD', KEYS[1]) > 0 then
+    return 0
+end
+redis.call('SREM', KEYS[2], KEYS[1])
+return 1
+"""
+
+# Removes the tasks ARGV that are still waiting in the queue together with their payloads;
+# payloads of tasks a worker already claimed are left for the worker.
+REMOVE_PENDING_SCRIPT = """
+local removed = 0
+for _, member in ipairs(ARGV) do
+    if redis.call('ZREM', KEYS[1], member) == 1 then
+        redis.call('HDEL', KEYS[2], member)
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
+# Moves a claimed task to the dead-letter set (keeping its payload and the failure reason
+# in a separate hash) and trims the set to the ARGV[4] most recent entries.
+DEAD_LETTER_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+local overflow = redis.call('ZRANGE', KEYS[3], 0, -(tonumber(ARGV[4]) + 1))
+if #overflow > 0 then
+    redis.call('ZREM', KEYS[3], unpack(overflow))
+    redis.call('HDEL', KEYS[4], unpack(overflow))
+end
+return #overflow
+"""
 
 
 class RedisScheduler:
@@ -26,69 +118,242 @@ class RedisScheduler:
     Scheduler for delayed Telegram messages using Redis sorted sets.
 
     Tasks are stored in a Redis sorted set named 'tasks', where the score is the
-    UNIX timestamp (in seconds) when the message should be sent, and the value is
-    a JSON-encoded dict containing the chat_id, text, and any additional args.
+    UNIX timestamp (in seconds, with millisecond precision) when the message should be sent, and the value is
+    a short task id. Payloads live in the 'tasks:payload' hash under the same id as
+    compact JSON: {"c": chat_id, "x": text, "k": send_message kwargs} or, instead of the
+    full text, {"t": template name, "a": template args} rendered at send time; "n" counts
+    failed attempts.
+
+    Workers claim due tasks atomically: a Lua script moves them from 'tasks' into the
+    worker's own 'tasks:processing:<worker>' set, where they stay until acknowledged.
+    Tasks not acknowledged within the visibility timeout go back to 'tasks', so several
+    dispatchers can drain the queue in parallel without duplicates or losses.
+    Tasks that cannot be delivered are moved to the bounded 'tasks:dead' set.
     """
 
-    def __init__(self, redis_url: str = None, logger: LoggerService = LoggerService("redis_scheduler")) -> None:
-        self.redis_url = redis_url if redis_url else f"redis://{REDIS_PORT}:{REDIS_PORT}"
+    tasks_key = "tasks"
+    payload_key = "tasks:payload"
+    sequence_key = "tasks:seq"
+    workers_key = "tasks:workers"
+    dead_key = "tasks:dead"
+    dead_payload_key = "tasks:dead:payload"
+
+    def __init__(
+            self,
+            redis_url: str = None,
+            logger: LoggerService = LoggerService("redis_scheduler"),
+            worker_id: str = None,
+            visibility_timeout: int = 300,
+            dead_letter_max: int = DEAD_LETTER_MAX
+    ) -> None:
+        self.redis_url = redis_url if redis_url else REDIS_URL
         self.redis = None
+        self.worker_id = worker_id if worker_id else f"{socket.gethostname()}:{os.getpid()}"
+        self.processing_key = f"tasks:processing:{self.worker_id}"
+        self.visibility_timeout = visibility_timeout
+        self.dead_letter_max = dead_letter_max
 
         self.logger = logger
+        self._claim = None
+        self._requeue = None
+        self._remove_pending = None
+        self._dead_letter = None
+        self._unregister = None
 
     async def connect(self):
         """Establish connection to Redis."""
         self.redis = await aioredis.from_url(self.redis_url, decode_responses=True)
+        self._claim = self.redis.register_script(CLAIM_SCRIPT)
+        self._requeue = self.redis.register_script(REQUEUE_SCRIPT)
+        self._remove_pending = self.redis.register_script(REMOVE_PENDING_SCRIPT)
+        self._dead_letter = self.redis.register_script(DEAD_LETTER_SCRIPT)
+        self._unregister = self.redis.register_script(UNREGISTER_SCRIPT)
         self.logger.info("Connected to Redis at %s", self.redis_url)
 
-    async def add_task(self, chat_id: int, text: str, send_at: datetime, **kwargs) -> None:
+    @staticmethod
+    def encode_task(
+            chat_id: int,
+            send_at: Moment,
+            text: str = None,
+            template: str = None,
+            template_args: dict = None,
+            **kwargs
+    ) -> Tuple[str, float]:
+        """Returns the payload and the score of a task (see to_score for accepted send times)."""
+        payload = RedisScheduler.__payload(chat_id, text, template, template_args, kwargs, attempts=0)
+        return payload, to_score(send_at)
+
+    @staticmethod
+    def __payload(chat_id: int, text: str, template: str, template_args: dict, kwargs: dict, attempts: int) -> str:
+        payload = {"c": chat_id}
+        if template:
+            payload["t"] = template
+            if template_args:
+                payload["a"] = template_args
+        else:
+            payload["x"] = text
+        if kwargs:
+            payload["k"] = kwargs
+        if attempts:
+            payload["n"] = attempts
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+    @staticmethod
+    def encode_payload(task: dict) -> str:
+        """Payload of a decoded task (see decode_task)."""
+        return RedisScheduler.__payload(
+            task["chat_id"], task["text"], task["template"], task["template_args"], task["args"], task["attempts"]
+        )
+
+    @staticmethod
+    def decode_task(task_id: str, raw: str) -> dict:
+        payload = json.loads(raw)
+        return {
+            "id": task_id,
+            "chat_id": payload["c"],
+            "text": payload.get("x"),
+            "template": payload.get("t"),
+            "template_args": payload.get("a", {}),
+            "args": payload.get("k", {}),
+            "attempts": payload.get("n", 0),
+        }
+
+    async def allocate_ids(self, count: int) -> List[str]:
+        """Reserves `count` task ids (base 36 numbers) with a single INCRBY."""
+        await self.__ensure_redis_connection()
+
+        last = await self.redis.incrby(self.sequence_key, count)
+        return [base36(number) for number in range(last - count + 1, last + 1)]
+
+    def queue_tasks(self, pipe, tasks: Dict[str, Tuple[str, float]]) -> None:
+        """Adds {task id: (payload, score)} to a pipeline."""
+        if not tasks:
+            return
+        pipe.hset(self.payload_key, mapping={task_id: payload for task_id, (payload, _) in tasks.items()})
+        pipe.zadd(self.tasks_key, {task_id: score for task_id, (_, score) in tasks.items()})
+
+    def queue_removal(self, pipe, task_ids: List[str]) -> None:
+        """
+        Adds removal of not yet claimed tasks to a pipeline. Tasks already claimed by a worker
+        keep their payloads, so they are still delivered (or requeued) normally.
+        """
+        if not task_ids:
+            return
+        self._remove_pending(keys=[self.tasks_key, self.payload_key], args=task_ids, client=pipe)
+
+    async def add_task(self, chat_id: int, text: str, send_at: Moment, **kwargs) -> str:
         """
         Schedule a new task.
 
         :param chat_id: Telegram chat ID
         :param text: Message text to send
-        :param send_at: datetime when the message should be sent
+        :param send_at: aware datetime, naive local datetime or UNIX timestamp when the message should be sent
         :param kwargs: Additional arguments to include in the payload
+        :return: Task id
         """
-        await self.__ensure_redis_connection()
+        task_id, = await self.allocate_ids(1)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self.queue_tasks(pipe, {task_id: self.encode_task(chat_id, send_at, text, **kwargs)})
+            await pipe.execute()
+        self.logger.info("Scheduled task %s for chat %s at %s", task_id, chat_id, isoformat(send_at))
+        return task_id
 
-        payload = {
-            "chat_id": chat_id,
-            "text": text,
-            "send_at": isoformat(send_at),
-            "args": kwargs,
-        }
-        timestamp = int(send_at.replace(tzinfo=timezone.utc).timestamp())
-        await self.redis.zadd("tasks", {json.dumps(payload): timestamp})
-        self.logger.info("Scheduled task for chat %s at %s", chat_id, payload["send_at"])
-
-    async def fetch_due(self) -> list:
+    async def fetch_due(self, limit: int = 100) -> list:
         """
-        Fetch and remove all tasks whose scheduled time is <= now.
+        Claim at most `limit` tasks whose scheduled time is <= now.
+        Each claimed task must be passed to `ack` once it is handled.
 
-        :return: List of payload dicts for due tasks
+        :return: List of decoded tasks (see decode_task)
         """
         await self.__ensure_redis_connection()
 
-        now_ts = int(datetime.now(timezone.utc).timestamp())
-        # Fetch due tasks
-        raw_tasks = await self.redis.zrangebyscore("tasks", min=-1, max=now_ts)
-        if not raw_tasks:
+        now_ts = now_score()
+        task_ids = await self._claim(
+            keys=[self.tasks_key, self.processing_key, self.workers_key],
+            args=[now_ts, limit, now_ts + self.visibility_timeout],
+        )
+        if not task_ids:
             return []
 
-        # Remove them from the set
-        await self.redis.zremrangebyscore("tasks", min=-1, max=now_ts)
-
-        tasks = []
-        for raw in raw_tasks:
+        tasks, broken = [], []
+        for task_id, raw in zip(task_ids, await self.redis.hmget(self.payload_key, task_ids)):
             try:
-                data = json.loads(raw)
-                data["send_at"] = parse_isoformat(data["send_at"])
-                tasks.append(data)
-            except json.JSONDecodeError:
-                await self.logger.error("Failed to decode task payload: %s", raw)
+                tasks.append(self.decode_task(task_id, raw))
+            except (TypeError, KeyError, json.JSONDecodeError):
+                await self.logger.error(f"Failed to decode task {task_id} payload: {raw}")
+                broken.append(task_id)
+        if broken:
+            await self.ack(*({"id": task_id} for task_id in broken))
         return tasks
 
+    async def ack(self, *tasks: dict) -> None:
+        """Remove handled tasks from the worker's processing set together with their payloads."""
+        if not tasks:
+            return
+        await self.__ensure_redis_connection()
+
+        task_ids = [task["id"] for task in tasks]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.processing_key, *task_ids)
+            pipe.hdel(self.payload_key, *task_ids)
+            await pipe.execute()
+
+    async def retry(self, task: dict, delay: float, count_attempt: bool = False) -> None:
+        """
+        Move a claimed task back to the queue to be sent again in `delay` seconds.
+
+        :param count_attempt: whether the retry follows a failed attempt (stored in the payload)
+        """
+        await self.__ensure_redis_connection()
+
+        retry_at = round(now_score() + delay, 3)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if count_attempt:
+                task["attempts"] += 1
+                pipe.hset(self.payload_key, task["id"], self.encode_payload(task))
+            pipe.zrem(self.processing_key, task["id"])
+            pipe.zadd(self.tasks_key, {task["id"]: retry_at})
+            await pipe.execute()
+
+    async def dead_letter(self, task: dict, reason: str) -> None:
+        """Move a claimed task to the dead-letter set."""
+        await self.__ensure_redis_connection()
+
+        now_ts = now_score()
+        entry = json.dumps({"p": self.encode_payload(task), "r": reason}, separators=(",", ":"), ensure_ascii=False)
+        await self._dead_letter(
+            keys=[self.processing_key, self.payload_key, self.dead_key, self.dead_payload_key],
+            args=[task["id"], now_ts, entry, self.dead_letter_max],
+        )
+
+    async def next_due_at(self) -> Optional[float]:
+        """UNIX timestamp of the earliest queued task, None if the queue is empty."""
+        await self.__ensure_redis_connection()
+
+        first = await self.redis.zrange(self.tasks_key, 0, 0, withscores=True)
+        return first[0][1] if first else None
+
+    async def requeue_expired(self) -> int:
+        """Return tasks whose visibility timeout expired, in any worker's processing set, to the queue."""
+        await self.__ensure_redis_connection()
+
+        now_ts = now_score()
+        requeued = 0
+        for processing_key in await self.redis.smembers(self.workers_key):
+            requeued += await self._requeue(
+                keys=[processing_key, self.tasks_key, self.workers_key], args=[now_ts, self.processing_key]
+            )
+        if requeued:
+            self.logger.warning(f"Requeued {requeued} tasks with expired visibility timeout")
+        return requeued
+
+    async def close(self) -> None:
+        """Unregister this worker (if it holds no tasks) and close the connection."""
+        if self.redis is None:
+            return
+        await self._unregister(keys=[self.processing_key, self.workers_key])
+        await self.redis.close()
+        self.redis = None
 
     async def __ensure_redis_connection(self) -> None:
         if self.redis is None:
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Callable, Optional, Sequence, Tuple
+
+import aioredis
+from pydantic import ValidationError
+
+from src.config import REDIS_URL, USER_REDIS_CACHE_TTL
+from src.database.schemas.user import UserSchemaFromDB
+from src.services.LoggerService import LoggerService
+
+
+REDIS_ERRORS = (aioredis.RedisError, ConnectionError, OSError, asyncio.TimeoutError)
+
+# KEYS: user key, user version key, global version key
+# ARGV: user json, ttl, user version and global version read before the Postgres query ("" if unset)
+SET_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[3] or (redis.call('GET', KEYS[3]) or '') ~= ARGV[4] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+class RedisUserCache:
+    """
+    Redis cache of users shared by all bot replicas.
+
+    Keys carry the schema version, so a deployment that changes UserSchemaFromDB never reads
+    entries written by the previous one. Writes delete the key, increment the user's version
+    counter and publish the user id, and every replica listening on the channel drops the user
+    from its in-process cache. `get` returns the versions it saw, and `set` stores the user only
+    if they have not changed since, so a row read from Postgres before a concurrent write cannot
+    be cached after that write invalidated it. Any Redis failure or unreadable entry is logged
+    and reported as a miss, so callers fall back to Postgres.
+    """
+
+    version = 2
+    channel = "user_cache:invalidate"
+    invalidate_all = "*"
+    global_version_key = "user_version"
+
+    def __init__(
+            self,
+            redis_url: str = REDIS_URL,
+            ttl: int = USER_REDIS_CACHE_TTL,
+            redis: aioredis.Redis = None,
+            logger: LoggerService = LoggerService("redis_user_cache")
+    ) -> None:
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.redis = redis  # a client may be injected, e.g. a fake Redis in tests
+        self.logger = logger
+
+        self._listener: Optional[asyncio.Task] = None
+        self._set_if_current = None
+
+    def key(self, user_id: int) -> str:
+        return f"user:v{self.version}:{user_id}"
+
+    @staticmethod
+    def version_key(user_id: int) -> str:
+        return f"user_version:{user_id}"
+
+    async def connect(self) -> None:
+        if self.redis is None:
+            self.redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        if self._set_if_current is None:
+            self._set_if_current = self.redis.register_script(SET_IF_CURRENT_SCRIPT)
+
+    async def get(self, user_id: int) -> Tuple[Optional[UserSchemaFromDB], Optional[Tuple[str, str]]]:
+        """The cached user (None on a miss) and the versions to pass to `set` (None if Redis failed)."""
+        try:
+            await self.connect()
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.get(self.key(user_id))
+                pipe.get(self.version_key(user_id))
+                pipe.get(self.global_version_key)
+                raw, user_version, global_version = await pipe.execute()
+        except REDIS_ERRORS as e:
+            self.logger.warning(f"Redis user cache is unavailable: {e!r}")
+            return None, None
+
+        version = (user_version or "", global_version or "")
+        if not raw:
+            return None, version
+        try:
+            return UserSchemaFromDB.model_validate_json(raw), version
+        except ValidationError as e:
+            self.logger.warning(f"Unreadable cached user {user_id}: {e.errors()[0]['msg']}")
+            return None, version
+
+    async def set(self, user: UserSchemaFromDB, version: Optional[Tuple[str, str]]) -> None:
+        """Caches the user unless it was invalidated after `get` returned `version`."""
+        if version is None:
+            return
+        try:
+            await self.connect()
+            await self._set_if_current(
+                keys=[self.key(user.id), self.version_key(user.id), self.global_version_key],
+                args=[user.model_dump_json(), self.ttl, *version]
+            )
+        except REDIS_ERRORS as e:
+            self.logger.warning(f"Redis user cache is unavailable: {e!r}")
+
+    async def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drops one user or, if the id is unknown, every user of the current version."""
+        try:
+            await self.connect()
+            if user_id is None:
+                # bump the version first: a user cached after it is rejected, one cached before is found by the scan
+                await self.redis.incr(self.global_version_key)
+                keys = [key async for key in self.redis.scan_iter(match=self.key("*"), count=1000)]
+                if keys:
+                    await self.redis.unlink(*keys)
+            else:
+                await self.__delete([user_id])
+            await self.redis.publish(self.channel, self.invalidate_all if user_id is None else str(user_id))
+        except REDIS_ERRORS as e:
+            self.logger.warning(f"Redis user cache is unavailable: {e!r}")
+
+    async def invalidate_many(self, user_ids: Sequence[int]) -> None:
+        """Drops the users with one DEL and one message (comma separated ids)."""
+        if not user_ids:
+            return
+        try:
+            await self.connect()
+            await self.__delete(user_ids)
+            await self.redis.publish(self.channel, ",".join(map(str, user_ids)))
+        except REDIS_ERRORS as e:
+            self.logger.warning(f"Redis user cache is unavailable: {e!r}")
+
+    async def __delete(self, user_ids: Sequence[int]) -> None:
+        """Deletes the users and increments their versions atomically."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self.key(user_id) for user_id in user_ids))
+            for user_id in user_ids:
+                pipe.incr(self.version_key(user_id))
+                # outlives any cached entry the version protects
+                pipe.expire(self.version_key(user_id), self.ttl)
+            await pipe.execute()
+
+    async def start(self, on_invalidate: Callable[[Optional[int]], None]) -> None:
+        """Starts listening for invalidations published by the other replicas."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self.__listen(on_invalidate))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self.redis is not None:
+            await self.redis.close()
+
+    async def __listen(self, on_invalidate: Callable[[Optional[int]], None]) -> None:
+        while True:
+            try:
+                await self.connect()
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    if data == self.invalidate_all:
+                        on_invalidate(None)
+                        continue
+                    for user_id in data.split(","):
+                        on_invalidate(int(user_id))
+            except asyncio.CancelledError:
+                raise
+            except REDIS_ERRORS as e:
+                # whatever was published meanwhile is lost, so start from an empty local cache
+                self.logger.warning(f"Redis invalidation channel is unavailable: {e!r}")
+                on_invalidate(None)
+                await asyncio.sleep(5)
@@ -0,0 +1,105 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional
+
+from src.config import REVIEW_LOG_BATCH_SIZE, REVIEW_LOG_FLUSH_INTERVAL_MS, REVIEW_LOG_MAX_BUFFER
+from src.database.handlers import Handlers
+from src.database.schemas import ReviewLogSchemaToDB
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.services.LoggerService import LoggerService
+
+
+class ReviewLogWriter:
+    """
+    In-process buffer of review events written to review_log in the background.
+
+    `add` only appends to memory, so answering a card never waits for the log. The buffer is
+    flushed with one multi-row insert, in its own unit of work, whenever `batch_size` events
+    have gathered or `flush_interval_ms` has passed, and drained on `close`. Events of a failed
+    flush are put back and retried with the next one; beyond `max_buffer` events the oldest are
+    dropped, so a database outage cannot exhaust memory.
+    """
+
+    def __init__(
+            self,
+            batch_size: int = REVIEW_LOG_BATCH_SIZE,
+            flush_interval_ms: int = REVIEW_LOG_FLUSH_INTERVAL_MS,
+            max_buffer: int = REVIEW_LOG_MAX_BUFFER,
+            logger: LoggerService = LoggerService("review_log_writer")
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.logger = logger
+
+        self._buffer: Deque[ReviewLogSchemaToDB] = deque(maxlen=max_buffer)
+        self._wakeup = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    def add(self, review: ReviewLogSchemaToDB) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(review)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Writes everything buffered so far. Returns the number of written events."""
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch: List[ReviewLogSchemaToDB] = [
+                    self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                try:
+                    async with UnitOfWork() as uow:
+                        await Handlers.review_log.add_many(uow, batch)
+                        await uow.commit()
+                except Exception as e:
+                    await self.logger.error(f"Failed to write {len(batch)} review log events: {e}")
+                    # events added meanwhile are newer; what does not fit are the oldest of the batch
+                    room = self._buffer.maxlen - len(self._buffer)
+                    if len(batch) > room:
+                        self.dropped += len(batch) - room
+                        batch = batch[len(batch) - room:]
+                    self._buffer.extendleft(reversed(batch))
+                    break
+                written += len(batch)
+            self.written += written
+            return written
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self.__run())
+
+    async def close(self) -> None:
+        """Stops the background flushing and drains the buffer."""
+        if self._task is not None:
+            # not cancelled: a batch already taken from the buffer must reach the database
+            self._stop.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._buffer:
+            self.logger.warning(f"{len(self._buffer)} review log events were not written")
+
+    async def __run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            if not await self.flush() and self._buffer:
+                # the first batch failed: back off instead of retrying on every new event
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
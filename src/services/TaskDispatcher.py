@@ -1,19 +1,41 @@
 import asyncio
-import json
-import logging
-from datetime import datetime, timezone
+import time
+from typing import List, Set
 
-from aiogram import Bot, Dispatcher, types
-from aiogram.utils import executor
-import aioredis
+from aiogram import Bot, Dispatcher
+from aiogram.exceptions import TelegramRetryAfter, TelegramForbiddenError, TelegramBadRequest
 
-from RedisScheduler import RedisScheduler
+from src.config import (
+    DISPATCHER_CONCURRENCY,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_CHAT_INTERVAL,
+    DISPATCHER_MAX_ATTEMPTS,
+    DISPATCHER_RETRY_BACKOFF
+)
+from src.database.handlers import Handlers
+from src.database.models import Models
+from src.database.schemas import UserSchemaUpdate, UserStatusSchema
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.services.RedisScheduler import RedisScheduler
+from src.services.RateLimiter import TokenBucket, KeyedRateLimiter
+from src.services.Metrics import DispatcherMetrics
 from src.services.LoggerService import LoggerService
+from src.messages.user import task_templates
 
 
 class TaskDispatcher:
     """
-    Periodically fetch due tasks from RedisScheduler and dispatch them via Telegram Bot.
+    Fetch due tasks from RedisScheduler and dispatch them via Telegram Bot.
+
+    Up to `concurrency` messages are sent at once, paced by a global token bucket
+    (Telegram allows ~30 messages per second) and a per-chat limiter. Flood-control
+    answers put the task back into the queue for the requested delay instead of dropping it.
+    Other failures are retried with exponential backoff up to `max_attempts` times, then the task
+    goes to the dead-letter set. Chats that blocked the bot or no longer exist are dead-lettered
+    at once and their users marked as blocked, so the planner stops scheduling for them;
+    tasks of users blocked in the database (checked once per batch) are dead-lettered unsent.
+    Outcomes and send latencies are collected in `metrics` and flushed to Redis after every batch.
+    Between batches the loop sleeps until the next task is due, at most `interval` seconds.
     """
 
     def __init__(
@@ -21,35 +43,146 @@ class TaskDispatcher:
             bot: Bot,
             scheduler: RedisScheduler,
             logger = LoggerService("task_dispatcher"),
-            interval: int = 60
+            interval: int = 60,
+            batch_size: int = 100,
+            concurrency: int = DISPATCHER_CONCURRENCY,
+            global_rate: float = TELEGRAM_GLOBAL_RATE,
+            chat_interval: float = TELEGRAM_CHAT_INTERVAL,
+            max_attempts: int = DISPATCHER_MAX_ATTEMPTS,
+            retry_backoff: float = DISPATCHER_RETRY_BACKOFF
     ):
         self.bot = bot
         self.scheduler = scheduler
         self.interval = interval
+        self.batch_size = batch_size
         self._task = None
         self.logger = logger
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.metrics = DispatcherMetrics()
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._global_limiter = TokenBucket(global_rate)
+        self._chat_limiter = KeyedRateLimiter(chat_interval)
+
+    @staticmethod
+    def _render(task: dict) -> str:
+        if task["template"]:
+            return task_templates[task["template"]](**task["template_args"])
+        return task["text"]
+
+    @staticmethod
+    def _is_unreachable(error: Exception) -> bool:
+        """The bot was blocked, or the chat was deleted: retrying will not help."""
+        if isinstance(error, TelegramForbiddenError):
+            return True
+        return isinstance(error, TelegramBadRequest) and "chat not found" in str(error).lower()
+
+    async def _blocked_chats(self, tasks: List[dict]) -> Set[int]:
+        """Chats of the tasks whose users are blocked, read in one query (none if the database fails)."""
+        chat_ids = {task["chat_id"] for task in tasks}
+        if not chat_ids:
+            return set()
+        try:
+            async with UnitOfWork() as uow:
+                users = await Handlers.handle_not_found_error(
+                    Handlers.user.get_all(
+                        uow, _filter=Models.user.c.id.in_(chat_ids), status=UserStatusSchema.BLOCKED
+                    ),
+                    return_if_err=[]
+                )
+        except Exception as e:
+            await self.logger.error(f"Failed to read blocked users: {e}")
+            return set()
+        return {user.id for user in users}
+
+    async def _block_user(self, chat_id: int) -> None:
+        try:
+            async with UnitOfWork() as uow:
+                await Handlers.user.update_one(uow, UserSchemaUpdate(status=UserStatusSchema.BLOCKED), id=chat_id)
+                await uow.commit()
+        except Exception as e:
+            await self.logger.error(f"Failed to mark user {chat_id} as blocked: {e}")
+
+    async def _dead_letter(self, task: dict, reason: str) -> None:
+        await self.scheduler.dead_letter(task, reason)
+        self.metrics.inc("dead_lettered")
+        self.logger.warning(f"Task {task['id']} for chat {task['chat_id']} moved to dead letters: {reason}")
+
+    async def _send(self, task: dict) -> None:
+        chat_id = task["chat_id"]
+        async with self._semaphore:
+            await self._chat_limiter.acquire(chat_id)
+            await self._global_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                await self.bot.send_message(chat_id, self._render(task), **task["args"])
+            except TelegramRetryAfter as e:
+                self._global_limiter.pause(e.retry_after)
+                await self.scheduler.retry(task, e.retry_after)
+                self.metrics.inc("rate_limited")
+                self.logger.warning(f"Flood control for chat {chat_id}, retrying in {e.retry_after}s")
+                return
+            except Exception as e:
+                self.metrics.inc("errors")
+                await self._handle_failure(task, e)
+                return
+            finally:
+                self.metrics.observe_send(time.perf_counter() - started)
+        await self.scheduler.ack(task)
+        self.metrics.inc("sent")
+        self.logger.info("Sent scheduled message to %s", chat_id)
+
+    async def _handle_failure(self, task: dict, error: Exception) -> None:
+        chat_id = task["chat_id"]
+        if self._is_unreachable(error):
+            await self._dead_letter(task, str(error))
+            await self._block_user(chat_id)
+        elif task["attempts"] + 1 < self.max_attempts:
+            delay = self.retry_backoff * 2 ** task["attempts"]
+            await self.scheduler.retry(task, delay, count_attempt=True)
+            self.metrics.inc("retries")
+            await self.logger.error(f"Failed to send scheduled message to {chat_id}: {error}, retrying in {delay}s")
+        else:
+            await self._dead_letter(task, str(error))
+
+    async def _sleep_until_next_due(self) -> None:
+        next_due_at = await self.scheduler.next_due_at()
+        delay = self.interval if next_due_at is None else next_due_at - time.time()
+        await asyncio.sleep(min(self.interval, max(delay, 0.1)))
 
     async def _dispatcher_loop(self):
         """Background loop: fetch due tasks and send messages."""
         await self.scheduler.connect()
         while True:
+            due_tasks = []
             try:
-                due_tasks = await self.scheduler.fetch_due()
-                for task in due_tasks:
-                    chat_id = task["chat_id"]
-                    text = task["text"]
-                    args = task.get("args", {})
-                    # Send the message
-                    await self.bot.send_message(chat_id, text, **args)
-                    self.logger.info("Sent scheduled message to %s", chat_id)
+                await self.scheduler.requeue_expired()
+                due_tasks = await self.scheduler.fetch_due(self.batch_size)
+                blocked = await self._blocked_chats(due_tasks)
+                await asyncio.gather(*(
+                    self._dead_letter(task, "user is blocked") if task["chat_id"] in blocked else self._send(task)
+                    for task in due_tasks
+                ))
+                await self.metrics.flush(self.scheduler.redis)
             except Exception as e:
-                await self.logger.error("Error in dispatcher loop: %s", e)
+                await self.logger.error(f"Error in dispatcher loop: {e}")
+
+            # a full batch means there are more due tasks waiting
+            if len(due_tasks) < self.batch_size:
+                try:
+                    await self._sleep_until_next_due()
+                except Exception as e:
+                    await self.logger.error(f"Error in dispatcher loop: {e}")
+                    await asyncio.sleep(self.interval)
 
-            await asyncio.sleep(self.interval)
+    async def run(self):
+        """Run the loop in the current task (for a standalone dispatcher process)."""
+        await self._dispatcher_loop()
 
     def start(self, dp: Dispatcher):
         """Register the dispatcher start handler to launch the loop."""
-        async def on_startup(_):
+        async def on_startup():
             self._task = asyncio.create_task(self._dispatcher_loop())
 
-        dp.startup.register(on_startup)
\ No newline at end of file
+        dp.startup.register(on_startup)
@@ -0,0 +1,49 @@
+from typing import Optional, Dict, Iterable
+from cachetools import TTLCache
+
+from src.config import USER_CACHE_MAXSIZE, USER_CACHE_TTL
+from src.database.schemas.user import UserSchemaFromDB
+
+
+class UserCache:
+    """
+    Bounded in-process TTL cache of users keyed by Telegram id.
+    Copies are handed out, so handlers may change the returned user without touching the cache.
+    Every invalidation advances `generation`; `set` with the generation read before loading the
+    user skips users invalidated meanwhile, so a concurrent write is never cached over.
+    """
+
+    def __init__(self, maxsize: int = USER_CACHE_MAXSIZE, ttl: float = USER_CACHE_TTL) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def get(self, user_id: int) -> Optional[UserSchemaFromDB]:
+        user = self._cache.get(user_id)
+        if user is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return user.model_copy()
+
+    def set(self, user: UserSchemaFromDB, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._cache[user.id] = user.model_copy()
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drops one user or, if the id is unknown, the whole cache."""
+        self.generation += 1
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(user_id, None)
+
+    def invalidate_many(self, user_ids: Iterable[int]) -> None:
+        self.generation += 1
+        for user_id in user_ids:
+            self._cache.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
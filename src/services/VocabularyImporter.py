@@ -0,0 +1,120 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from src.database.handlers import Handlers
+from src.database.schemas import WordSchemaToDB, EnglishLevel
+from src.database.utils.UnitOfWork import UnitOfWork
+from src.services.LoggerService import LoggerService
+
+
+LEVEL_ALIASES = {
+    "beginner": EnglishLevel.A1,
+    "elementary": EnglishLevel.A2,
+    "pre-intermediate": EnglishLevel.A2,
+    "intermediate": EnglishLevel.B1,
+    "upper-intermediate": EnglishLevel.B2,
+    "advanced": EnglishLevel.C1,
+}
+
+
+def normalise_level(value) -> Optional[EnglishLevel]:
+    """'b1', ' B1 ' and 'intermediate' all become EnglishLevel.B1; None for unsupported levels."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return EnglishLevel(value.upper())
+    except ValueError:
+        return LEVEL_ALIASES.get(value.lower().replace(" ", "-").replace("_", "-"))
+
+
+class VocabularyImporter:
+    """
+    Loads a CEFR word list (CSV with a header row or JSON lines, with text, translation,
+    example and level fields) into the word table.
+
+    The file is streamed through generators - read, validate with WordSchemaToDB,
+    drop repeated texts - and handed to the database in batches, so memory stays bounded
+    by the batch size (plus the set of seen texts). The batches are COPYed into a staging
+    table and merged with a single INSERT ... ON CONFLICT in one transaction: the import is
+    all or nothing, and running it again with the same file changes nothing.
+    """
+
+    def __init__(
+            self,
+            batch_size: int = 5000,
+            logger: LoggerService = LoggerService("vocabulary_importer")
+    ) -> None:
+        self.batch_size = batch_size
+        self.logger = logger
+        self.stats: Dict[str, int] = {"read": 0, "invalid": 0, "duplicates": 0, "inserted": 0, "updated": 0}
+
+    def read(self, path: Path) -> Iterator[dict]:
+        """Rows of the file; malformed JSON lines are counted as invalid and skipped."""
+        with open(path, encoding="utf-8", newline="") as f:
+            if path.suffix.lower() in (".jsonl", ".ndjson"):
+                for number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        self.stats["read"] += 1
+                        self.stats["invalid"] += 1
+                        self.logger.warning(f"Skipping line {number}: {e.msg}")
+                        continue
+                    yield row
+            else:
+                yield from csv.DictReader(f)
+
+    def validate(self, rows: Iterable[dict]) -> Iterator[WordSchemaToDB]:
+        for number, row in enumerate(rows, start=1):
+            self.stats["read"] += 1
+            try:
+                if not isinstance(row, dict):
+                    raise TypeError(f"expected an object, got {type(row).__name__}")
+                word = WordSchemaToDB(
+                    text=row.get("text"),
+                    translation=row.get("translation"),
+                    example=row.get("example") or None,
+                    level=normalise_level(row.get("level")),
+                )
+            except TypeError as e:
+                self.stats["invalid"] += 1
+                self.logger.warning(f"Skipping row {number}: {e}")
+                continue
+            except ValidationError as e:
+                self.stats["invalid"] += 1
+                self.logger.warning(f"Skipping row {number}: {e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+                continue
+            yield word
+
+    def deduplicate(self, words: Iterable[WordSchemaToDB]) -> Iterator[WordSchemaToDB]:
+        """Keeps the first occurrence of every text (text is unique in the word table)."""
+        seen = set()
+        for word in words:
+            if word.text in seen:
+                self.stats["duplicates"] += 1
+                continue
+            seen.add(word.text)
+            yield word
+
+    def batches(self, words: Iterable[WordSchemaToDB]) -> Iterator[List[WordSchemaToDB]]:
+        words = iter(words)
+        while batch := list(islice(words, self.batch_size)):
+            yield batch
+
+    async def run(self, path: Path) -> Dict[str, int]:
+        words = self.deduplicate(self.validate(self.read(path)))
+        async with UnitOfWork() as uow:
+            inserted, updated = await Handlers.word.bulk_import(uow, self.batches(words))
+            await uow.commit()
+
+        self.stats.update(inserted=inserted, updated=updated)
+        self.logger.info(f"Imported {path}: {self.stats}")
+        return self.stats
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Tuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class SpacedRepetition:
     # Константы для алгоритма SM-2
@@ -8,12 +11,18 @@ class SpacedRepetition:
     INITIAL_INTERVAL = 1
     SECOND_INTERVAL = 6
 
+    @staticmethod
+    def ease_factor_delta(quality: int) -> float:
+        """Изменение фактора легкости после ответа качества quality (0-5)."""
+        return 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+
     @staticmethod
     def calculate_next_review(
         current_interval: int,
         current_ease_factor: float,
         repetitions: int,
-        quality: int  # 0-5, где 5 - отлично, 0 - не помню
+        quality: int,  # 0-5, где 5 - отлично, 0 - не помню
+        now: Optional[datetime] = None
     ) -> Tuple[int, float, int, datetime]:
         """
         Рассчитывает следующие параметры для карточки на основе алгоритма SM-2.
@@ -23,13 +32,14 @@ class SpacedRepetition:
             current_ease_factor: Текущий фактор легкости
             repetitions: Количество повторений
             quality: Качество ответа (0-5)
+            now: Момент ответа, от которого отсчитывается интервал (по умолчанию datetime.now())
             
         Returns:
             Tuple[int, float, int, datetime]: (новый интервал, новый фактор легкости, 
                                              новое количество повторений, следующая дата повторения)
         """
         # Обновляем фактор легкости
-        new_ease_factor = current_ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        new_ease_factor = current_ease_factor + SpacedRepetition.ease_factor_delta(quality)
         new_ease_factor = max(SpacedRepetition.MIN_EASE_FACTOR, new_ease_factor)
 
         # Обновляем интервал
@@ -44,10 +54,59 @@ class SpacedRepetition:
         new_repetitions = repetitions + 1 if quality >= 3 else 0
 
         # Рассчитываем следующую дату повторения
-        next_review = datetime.now() + timedelta(days=new_interval)
+        now = now if now else datetime.now()
+        next_review = now + timedelta(days=new_interval)
 
         return new_interval, new_ease_factor, new_repetitions, next_review
 
+    @staticmethod
+    def calculate_next_review_batch(
+        intervals: "np.ndarray",
+        ease_factors: "np.ndarray",
+        repetitions: "np.ndarray",
+        qualities: "np.ndarray",
+        now: datetime
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Векторизованный calculate_next_review для массивов карточек (пересчет расписаний,
+        исправление данных, симуляции). Результаты совпадают с поэлементным вызовом
+        calculate_next_review(..., now=now). Скаляры растягиваются до длины массивов.
+        Требует numpy.
+
+        Args:
+            intervals: Текущие интервалы в днях
+            ease_factors: Текущие факторы легкости
+            repetitions: Количества повторений
+            qualities: Качества ответов (0-5)
+            now: Момент ответа, общий для всех карточек (naive, как datetime.now())
+
+        Returns:
+            Tuple[np.ndarray, ...]: (новые интервалы int64, новые факторы легкости float64,
+                                     новые количества повторений int64, следующие даты повторения datetime64[us])
+        """
+        import numpy as np
+
+        intervals, ease_factors, repetitions, qualities = np.broadcast_arrays(
+            np.asarray(intervals, dtype=np.int64),
+            np.asarray(ease_factors, dtype=np.float64),
+            np.asarray(repetitions, dtype=np.int64),
+            np.asarray(qualities, dtype=np.int64),
+        )
+
+        new_ease_factors = np.maximum(
+            SpacedRepetition.MIN_EASE_FACTOR,
+            ease_factors + SpacedRepetition.ease_factor_delta(qualities)
+        )
+        new_intervals = np.select(
+            [repetitions == 0, repetitions == 1],
+            [SpacedRepetition.INITIAL_INTERVAL, SpacedRepetition.SECOND_INTERVAL],
+            default=np.trunc(intervals * new_ease_factors)
+        ).astype(np.int64)
+        new_repetitions = np.where(qualities >= 3, repetitions + 1, 0)
+        next_reviews = np.datetime64(now, "us") + new_intervals.astype("timedelta64[D]")
+
+        return new_intervals, new_ease_factors, new_repetitions, next_reviews
+
     @staticmethod
     def get_initial_values() -> Tuple[int, float, int, datetime]:
         """